@@ -3,9 +3,11 @@ from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 import firebase_admin
 from firebase_admin import credentials, firestore
-from ...services.poker_crawler import LivePokerScoutCrawler, upload_to_firestore_efficiently
+from ...services.poker_crawler import LivePokerScoutCrawler, upload_to_firestore_efficiently_async
 import os
 import logging
+import heapq
+from operator import itemgetter
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -53,13 +55,13 @@ async def crawl_and_save_data(x_api_key: Optional[str] = Header(None)):
     
     try:
         crawler = LivePokerScoutCrawler()
-        crawled_data = crawler.crawl_pokerscout_data()
+        crawled_data = await crawler.crawl_pokerscout_data_async()
         
         if not crawled_data:
             raise HTTPException(status_code=500, detail="PokerScout에서 데이터를 가져오는데 실패했습니다.")
         
-        # Firebase에 데이터 업로드
-        upload_to_firestore_efficiently(crawled_data)
+        # Firebase에 데이터 업로드 (변하지 않은 사이트의 traffic_logs는 업로드 함수에서 생략)
+        await upload_to_firestore_efficiently_async(crawled_data)
         
         return {
             "message": "데이터가 성공적으로 크롤링되고 저장되었습니다!",
@@ -184,9 +186,8 @@ async def get_top10_daily_stats(days: int = 7):
                 })
                 break
         
-        # 온라인 플레이어 수로 정렬하여 상위 10개 선택
-        current_ranking.sort(key=lambda x: x['players_online'], reverse=True)
-        top10_sites = current_ranking[:10]
+        # 온라인 플레이어 수 기준 상위 10개 선택 (전체 정렬 없이 O(n log k))
+        top10_sites = heapq.nlargest(10, current_ranking, key=itemgetter('players_online'))
         
         # 전체 플레이어 수 계산 (점유율 계산용)
         total_players = sum(site['players_online'] for site in current_ranking)
@@ -286,10 +287,8 @@ async def get_top10_by_category(days: int = 7):
         
         # 각 카테고리별로 정렬하여 상위 10개 선택
         categories = {
-            'players_online': sorted(current_ranking, key=lambda x: x['players_online'], reverse=True)[:10],
-            'cash_players': sorted(current_ranking, key=lambda x: x['cash_players'], reverse=True)[:10],
-            'peak_24h': sorted(current_ranking, key=lambda x: x['peak_24h'], reverse=True)[:10],
-            'seven_day_avg': sorted(current_ranking, key=lambda x: x['seven_day_avg'], reverse=True)[:10]
+            field: heapq.nlargest(10, current_ranking, key=itemgetter(field))
+            for field in ('players_online', 'cash_players', 'peak_24h', 'seven_day_avg')
         }
         
         # 각 카테고리별 전체 합계 계산
@@ -11,7 +11,7 @@ router = APIRouter()
 @router.post("/crawl_and_save_data/")
 async def crawl_and_save_data(db: Session = Depends(get_db)):
     crawler = LivePokerScoutCrawler()
-    crawled_data = crawler.crawl_pokerscout_data()
+    crawled_data = await crawler.crawl_pokerscout_data_async()
 
     if not crawled_data:
         raise HTTPException(status_code=500, detail="Failed to crawl data from PokerScout.")
@@ -6,60 +6,214 @@ online_data_collector.py와 동일한 로직으로 전체 사이트 크롤링
 + Firebase Firestore 연동 기능 추가 (효율적인 구조)
 """
 
+import asyncio
 import cloudscraper
-from bs4 import BeautifulSoup
-import json
+from cloudscraper import CipherSuiteAdapter
+import gzip
+import orjson
 from datetime import datetime, timezone
 import logging
 import sys
-import re
 import os
+import time
+from functools import lru_cache
+
+import tempfile
 
 import firebase_admin
 from firebase_admin import credentials, firestore
 
-# Firebase Admin SDK 초기화
 try:
-    # GitHub Actions 환경과 로컬 환경 모두 지원
-    possible_key_paths = [
-        # GitHub Actions 환경
-        os.path.join(os.path.dirname(__file__), '..', '..', 'key', 'firebase-service-account-key.json'),
-        # 로컬 환경 (backend 폴더 기준)
-        os.path.join(os.path.dirname(__file__), '..', '..', '..', 'key', 'firebase-service-account-key.json'),
-        # 환경 변수로 지정된 경로
-        os.environ.get('FIREBASE_KEY_PATH', '')
-    ]
-    
-    key_path = None
-    for path in possible_key_paths:
-        if path and os.path.exists(path):
-            key_path = os.path.abspath(path)
-            break
-    
-    if not key_path:
-        raise FileNotFoundError("Firebase 서비스 계정 키 파일을 찾을 수 없습니다.")
-    
-    cred = credentials.Certificate(key_path)
-    if not firebase_admin._apps:
-        firebase_admin.initialize_app(cred)
-    db = firestore.client()
-    logger = logging.getLogger(__name__)
-    logger.info(f"Firebase Admin SDK가 성공적으로 초기화되었습니다. (키 파일: {key_path})")
-except Exception as e:
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-    logger = logging.getLogger(__name__)
-    logger.error(f"Firebase Admin SDK 초기화 실패: {e}")
-    db = None
-
-# 로깅 설정 (Firebase 초기화 후 설정 보장)
+    from requests_cache import CacheMixin
+except ImportError:
+    CacheMixin = None
+
+try:
+    from .pokerscout_rows import extract_site_rows
+except ImportError:
+    # 스크립트로 직접 실행하는 경우 (python poker_crawler.py)
+    from pokerscout_rows import extract_site_rows
+
+# 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def _get_db():
+    """
+    Firebase Admin SDK를 처음 사용할 때 한 번만 초기화하고 Firestore 클라이언트를 반환합니다.
+    (초기화 실패 시 None)
+    """
+    try:
+        # GitHub Actions 환경과 로컬 환경 모두 지원
+        possible_key_paths = [
+            # GitHub Actions 환경
+            os.path.join(os.path.dirname(__file__), '..', '..', 'key', 'firebase-service-account-key.json'),
+            # 로컬 환경 (backend 폴더 기준)
+            os.path.join(os.path.dirname(__file__), '..', '..', '..', 'key', 'firebase-service-account-key.json'),
+            # 환경 변수로 지정된 경로
+            os.environ.get('FIREBASE_KEY_PATH', '')
+        ]
+        
+        key_path = None
+        for path in possible_key_paths:
+            if path and os.path.exists(path):
+                key_path = os.path.abspath(path)
+                break
+        
+        if not key_path:
+            raise FileNotFoundError("Firebase 서비스 계정 키 파일을 찾을 수 없습니다.")
+        
+        if not firebase_admin._apps:
+            firebase_admin.initialize_app(credentials.Certificate(key_path))
+        logger.info(f"Firebase Admin SDK가 성공적으로 초기화되었습니다. (키 파일: {key_path})")
+        return firestore.client()
+    except Exception as e:
+        logger.error(f"Firebase Admin SDK 초기화 실패: {e}")
+        return None
+
+# 크롤링 결과 캐시 설정
+# - REDIS_URL이 설정되어 있으면 Redis 사용 (프로세스 간 공유)
+# - 없으면 프로세스 내부 메모리 캐시로 폴백
+CRAWL_CACHE_KEY = 'pokerscout:rankTable'
+CRAWL_CACHE_TTL = int(os.environ.get('POKERSCOUT_CACHE_TTL', '60'))
+_local_cache = {}
+
+@lru_cache(maxsize=1)
+def _get_redis():
+    """Redis 클라이언트 (REDIS_URL 미설정 또는 연결 실패 시 None)"""
+    redis_url = os.environ.get('REDIS_URL')
+    if not redis_url:
+        return None
+    try:
+        import redis
+        client = redis.Redis.from_url(redis_url, decode_responses=False)
+        client.ping()
+        return client
+    except Exception as e:
+        logger.warning(f"Redis 연결 실패, 메모리 캐시를 사용합니다: {e}")
+        return None
+
+def _cache_get(key):
+    client = _get_redis()
+    if client is not None:
+        try:
+            return client.get(key)
+        except Exception as e:
+            logger.warning(f"Redis 캐시 조회 실패: {e}")
+            return None
+    entry = _local_cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+def _cache_set(key, value, ttl):
+    client = _get_redis()
+    if client is not None:
+        try:
+            client.set(key, value, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Redis 캐시 저장 실패: {e}")
+        return
+    _local_cache[key] = (time.monotonic() + ttl, value)
+
+# HTTP 응답 캐시 (requests-cache 설치 시에만 사용, ETag/Last-Modified 재검증)
+HTTP_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'pokerscout_cache')
+HTTP_CACHE_EXPIRE = 30
+
+if CacheMixin is not None:
+    class CachedCloudScraper(CacheMixin, cloudscraper.CloudScraper):
+        """요청/응답 캐시가 적용된 cloudscraper 세션"""
+
+def _create_scraper():
+    """
+    프로세스 전역에서 공유할 cloudscraper 세션 생성
+    - cloudscraper의 TLS 설정(ssl_context)은 그대로 두고 커넥션 풀 크기만 확장
+    - keep-alive로 이후 요청에서 TLS 연결과 Cloudflare 쿠키를 재사용
+    - requests-cache가 있으면 응답을 캐시하고 조건부 요청(304)으로 재검증
+    """
+    browser = {'browser': 'chrome', 'platform': 'linux', 'mobile': False}
+    if CacheMixin is not None:
+        scraper = CachedCloudScraper.create_scraper(
+            browser=browser,
+            cache_name=HTTP_CACHE_PATH,
+            backend='sqlite',
+            expire_after=HTTP_CACHE_EXPIRE,
+            cache_control=True
+        )
+    else:
+        scraper = cloudscraper.create_scraper(browser=browser)
+    tls_adapter = scraper.get_adapter('https://')
+    scraper.mount('https://', CipherSuiteAdapter(
+        ssl_context=tls_adapter.ssl_context,
+        pool_connections=10,
+        pool_maxsize=20
+    ))
+    scraper.headers['Connection'] = 'keep-alive'
+    return scraper
+
+_SCRAPER = _create_scraper()
+
+def _load_cached_crawl():
+    cached = _cache_get(CRAWL_CACHE_KEY)
+    if not cached:
+        return None
+    logger.info("캐시된 PokerScout 데이터 사용")
+    return orjson.loads(cached)
+
+def _store_cached_crawl(data):
+    if data:
+        _cache_set(CRAWL_CACHE_KEY, orjson.dumps(data), CRAWL_CACHE_TTL)
+
+# 사이트별 마지막 업로드 트래픽 지문 (변경 없는 traffic_logs 쓰기 생략용)
+TRAFFIC_FINGERPRINT_KEY = 'ps:fp'
+_local_fingerprints = {}
+
+def _traffic_fingerprint(site_data):
+    """4개 통계 값을 각 32비트 필드로 묶은 정수 지문 (문자열로 저장)"""
+    return str(
+        (site_data['players_online'] << 96)
+        | (site_data['cash_players'] << 64)
+        | (site_data['peak_24h'] << 32)
+        | site_data['seven_day_avg']
+    )
+
+def _load_traffic_fingerprints(site_names):
+    client = _get_redis()
+    if client is None:
+        return {name: _local_fingerprints.get(name) for name in site_names}
+    try:
+        values = client.hmget(TRAFFIC_FINGERPRINT_KEY, site_names)
+        return {name: v.decode() if v else None for name, v in zip(site_names, values)}
+    except Exception as e:
+        logger.warning(f"Redis 트래픽 지문 조회 실패: {e}")
+        return {}
+
+def _store_traffic_fingerprints(fingerprints):
+    if not fingerprints:
+        return
+    client = _get_redis()
+    if client is None:
+        _local_fingerprints.update(fingerprints)
+        return
+    try:
+        client.hset(TRAFFIC_FINGERPRINT_KEY, mapping=fingerprints)
+    except Exception as e:
+        logger.warning(f"Redis 트래픽 지문 저장 실패: {e}")
+
+@lru_cache(maxsize=32)
+def _parse_collected_at(collected_at_iso):
+    """ISO 8601 문자열을 Firestore 타임스탬프용 datetime으로 변환 (크롤링 단위로 같은 값이 반복되므로 캐시)"""
+    return datetime.fromisoformat(collected_at_iso).replace(tzinfo=timezone.utc)
 
 def upload_to_firestore_efficiently(data):
     """
     수집된 데이터를 효율적인 구조로 Firestore에 업로드합니다.
     - `sites` 컬렉션: 사이트의 고정 정보 저장 (중복 방지)
     - `traffic_logs` 하위 컬렉션: 시간에 따른 트래픽 데이터 저장
+      (직전 업로드와 통계 값이 같은 사이트는 로그 쓰기 생략)
     """
+    db = _get_db()
     if not db:
         logger.error("Firestore 클라이언트가 초기화되지 않아 업로드할 수 없습니다.")
         return
@@ -70,8 +224,21 @@ def upload_to_firestore_efficiently(data):
 
     logger.info("효율적인 구조로 Firestore에 데이터 업로드 시작...")
     
-    # Batch Write를 사용하여 여러 작업을 한 번의 요청으로 처리
-    batch = db.batch()
+    # BulkWriter: 여러 RPC를 병렬로 파이프라이닝하고 실패 시 자동 재시도 (500건 배치 제한 없음)
+    bulk_writer = db.bulk_writer()
+    failed_writes = []
+
+    def _on_write_error(error, _writer):
+        if error.attempts < 3:
+            return True  # 재시도
+        failed_writes.append(error.operation.reference.path)
+        logger.error(f"Firestore 쓰기 실패 ({error.operation.reference.path}): {error.message}")
+        return False
+
+    bulk_writer.on_write_error(_on_write_error)
+
+    previous_fingerprints = _load_traffic_fingerprints([site['site_name'] for site in data])
+    changed_fingerprints = {}
     
     for site_data in data:
         site_name = site_data['site_name']
@@ -85,103 +252,118 @@ def upload_to_firestore_efficiently(data):
             'last_updated_at': firestore.SERVER_TIMESTAMP # 서버 시간으로 업데이트
         }
         # set(..., merge=True)를 사용하여 기존 문서는 업데이트, 없는 문서는 생성
-        batch.set(site_ref, site_info, merge=True)
+        bulk_writer.set(site_ref, site_info, merge=True)
+
+        # 2. `traffic_logs` 하위 컬렉션 처리 (통계 변화가 없으면 생략)
+        fingerprint = _traffic_fingerprint(site_data)
+        if previous_fingerprints.get(site_name) == fingerprint:
+            continue
+        changed_fingerprints[site_name] = fingerprint
 
-        # 2. `traffic_logs` 하위 컬렉션 처리
         log_ref = site_ref.collection('traffic_logs').document(collected_at_iso)
         traffic_data = {
             'players_online': site_data['players_online'],
             'cash_players': site_data['cash_players'],
             'peak_24h': site_data['peak_24h'],
             'seven_day_avg': site_data['seven_day_avg'],
-            # ISO 8601 문자열을 Firestore 타임스탬프 객체로 변환
-            'collected_at': datetime.fromisoformat(collected_at_iso).replace(tzinfo=timezone.utc)
+            'collected_at': _parse_collected_at(collected_at_iso)
         }
-        batch.set(log_ref, traffic_data)
+        bulk_writer.set(log_ref, traffic_data)
 
     try:
-        # Batch 작업 일괄 커밋
-        batch.commit()
-        logger.info(f"성공적으로 {len(data)}개 사이트의 데이터를 효율적인 구조로 Firestore에 업로드했습니다.")
+        # 남은 작업을 모두 전송하고 완료될 때까지 대기
+        bulk_writer.close()
+
+        # 쓰기에 성공한 사이트의 지문만 갱신 (실패한 사이트는 다음 크롤링에서 다시 기록)
+        failed_sites = {path.split('/')[1] for path in failed_writes}
+        _store_traffic_fingerprints({
+            name: fp for name, fp in changed_fingerprints.items() if name not in failed_sites
+        })
+
+        skipped = len(data) - len(changed_fingerprints)
+        if skipped:
+            logger.info(f"통계 변화가 없는 {skipped}개 사이트의 traffic_logs 쓰기를 생략했습니다.")
+        if failed_writes:
+            logger.warning(f"Firestore 업로드 중 {len(failed_writes)}건의 쓰기가 실패했습니다.")
+        else:
+            logger.info(f"성공적으로 {len(data)}개 사이트의 데이터를 효율적인 구조로 Firestore에 업로드했습니다.")
     except Exception as e:
-        logger.error(f"Firestore Batch 업로드 중 오류 발생: {e}")
+        logger.error(f"Firestore BulkWriter 업로드 중 오류 발생: {e}")
         import traceback
         logger.error(traceback.format_exc())
 
+async def upload_to_firestore_efficiently_async(data):
+    """upload_to_firestore_efficiently를 스레드에서 실행하여 이벤트 루프를 막지 않습니다."""
+    await asyncio.to_thread(upload_to_firestore_efficiently, data)
+
 class LivePokerScoutCrawler:
     def __init__(self):
-        self.scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'linux', 'mobile': False}
-        )
-        self.gg_poker_sites = ['GGNetwork', 'GGPoker ON', 'GG Poker', 'GGPoker']
+        self.scraper = _SCRAPER
+        self.gg_poker_sites = frozenset(['GGNetwork', 'GGPoker ON', 'GG Poker', 'GGPoker'])
+        
+    def _fetch_page(self, force_refresh=False):
+        """PokerScout 메인 페이지 요청 (블로킹 I/O, force_refresh=True면 HTTP 캐시도 사용하지 않음)"""
+        kwargs = {}
+        if force_refresh and CacheMixin is not None:
+            # requests-cache의 force_refresh: 캐시를 읽지 않고 항상 새로 요청한 뒤 캐시를 갱신
+            kwargs['force_refresh'] = True
+        response = self.scraper.get('https://www.pokerscout.com', timeout=30, **kwargs)
+        response.raise_for_status()
+        logger.info(f"응답 상태 코드: {response.status_code}")
+        if getattr(response, 'from_cache', False):
+            logger.info("HTTP 캐시된 PokerScout 응답 사용")
+        return response
+
+    def _parse_page(self, content):
+        """응답 HTML에서 rankTable 행을 파싱 (CPU 작업, 동기 실행)"""
+        # 한 번의 크롤링에서 수집된 모든 행은 같은 수집 시각을 공유
+        collected_at = datetime.now(timezone.utc).isoformat()
+        
+        row_count, collected_data = extract_site_rows(content, self.gg_poker_sites, collected_at)
         
-    def crawl_pokerscout_data(self):
+        if row_count == 0:
+            logger.error("PokerScout 테이블을 찾을 수 없습니다")
+            return []
+        
+        logger.info(f"rankTable 처리 행 수: {row_count}")
+        logger.info(f"크롤링 완료: {len(collected_data)}개 사이트 수집")
+        return collected_data
+
+    def crawl_pokerscout_data(self, force_refresh=False):
+        """
+        PokerScout 데이터 크롤링
+        - 최근 CRAWL_CACHE_TTL초 이내 결과가 캐시에 있으면 그대로 반환
+        - force_refresh=True: 캐시를 무시하고 새로 크롤링 (스케줄 저장용)
+        """
+        if not force_refresh and (cached := _load_cached_crawl()) is not None:
+            return cached
+
         logger.info("PokerScout 실시간 크롤링 시작...")
         try:
-            response = self.scraper.get('https://www.pokerscout.com', timeout=30)
-            response.raise_for_status()
-            logger.info(f"응답 상태 코드: {response.status_code}")
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            table = soup.find('table', {'class': 'rankTable'})
-            if not table:
-                logger.error("PokerScout 테이블을 찾을 수 없습니다")
-                return []
-            
-            logger.info("rankTable 발견!")
-            collected_data = []
-            rows = table.find_all('tr')[1:]
-            logger.info(f"발견된 행 수: {len(rows)}")
-            
-            for i, row in enumerate(rows):
-                try:
-                    if 'cus_top_traffic_coin' in row.get('class', []):
-                        continue
-                    brand_title = row.find('span', {'class': 'brand-title'})
-                    if not brand_title:
-                        continue
-                    site_name = brand_title.get_text(strip=True)
-                    if not site_name or len(site_name) < 2:
-                        continue
-                    
-                    players_online, cash_players, peak_24h, seven_day_avg = 0, 0, 0, 0
-                    
-                    online_td = row.find('td', {'id': 'online'})
-                    if online_td and (span := online_td.find('span')) and (text := span.get_text(strip=True).replace(',', '')) and text.isdigit():
-                        players_online = int(text)
-                    
-                    cash_td = row.find('td', {'id': 'cash'})
-                    if cash_td and (text := cash_td.get_text(strip=True).replace(',', '')) and text.isdigit():
-                        cash_players = int(text)
-
-                    peak_td = row.find('td', {'id': 'peak'})
-                    if peak_td and (span := peak_td.find('span')) and (text := span.get_text(strip=True).replace(',', '')) and text.isdigit():
-                        peak_24h = int(text)
-
-                    avg_td = row.find('td', {'id': 'avg'})
-                    if avg_td and (span := avg_td.find('span')) and (text := span.get_text(strip=True).replace(',', '')) and text.isdigit():
-                        seven_day_avg = int(text)
-
-                    if players_online == 0 and cash_players == 0 and peak_24h == 0:
-                        continue
-                    
-                    site_name = re.sub(r'[^\w\s\-\(\)\.&]', '', site_name).strip()
-                    category = 'GG_POKER' if site_name in self.gg_poker_sites else 'COMPETITOR'
-                    
-                    collected_data.append({
-                        'site_name': site_name,
-                        'category': category,
-                        'players_online': players_online,
-                        'cash_players': cash_players,
-                        'peak_24h': peak_24h,
-                        'seven_day_avg': seven_day_avg,
-                        'collected_at': datetime.now(timezone.utc).isoformat()
-                    })
-                except Exception as e:
-                    logger.error(f"행 {i+1} 처리 중 오류: {str(e)}")
-                    continue
-            
-            logger.info(f"크롤링 완료: {len(collected_data)}개 사이트 수집")
+            response = self._fetch_page(force_refresh)
+            collected_data = self._parse_page(response.content)
+            _store_cached_crawl(collected_data)
+            return collected_data
+        except Exception as e:
+            logger.error(f"크롤링 실패: {str(e)}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return []
+
+    async def crawl_pokerscout_data_async(self, force_refresh=False):
+        """
+        crawl_pokerscout_data의 비동기 버전 (FastAPI 엔드포인트용)
+        - 네트워크 요청은 스레드에서 실행하여 이벤트 루프를 막지 않음
+        - Cloudflare 우회를 위해 cloudscraper 세션은 그대로 사용
+        """
+        if not force_refresh and (cached := _load_cached_crawl()) is not None:
+            return cached
+
+        logger.info("PokerScout 실시간 크롤링 시작...")
+        try:
+            response = await asyncio.to_thread(self._fetch_page, force_refresh)
+            collected_data = self._parse_page(response.content)
+            _store_cached_crawl(collected_data)
             return collected_data
         except Exception as e:
             logger.error(f"크롤링 실패: {str(e)}")
@@ -189,7 +371,11 @@ class LivePokerScoutCrawler:
             logger.error(traceback.format_exc())
             return []
     
-    def analyze_and_save(self, data):
+    def analyze_and_save(self, data, backup=False):
+        """
+        크롤링 결과 요약 후 Firestore에 업로드합니다.
+        - backup=True: data 폴더의 롤링 백업 파일(gzip)도 갱신
+        """
         if not data:
             logger.error("분석할 데이터가 없습니다")
             return
@@ -202,23 +388,19 @@ class LivePokerScoutCrawler:
         total_players = sum(site['players_online'] for site in data)
         logger.info(f"총 사이트 수: {total_sites}개, 총 온라인 플레이어: {total_players:,}명")
         
-        # 로컬 JSON 파일 저장 (백업 및 디버깅용)
-        filename = f"live_crawling_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        logger.info(f"💾 결과가 로컬 백업 파일({filename})에 저장되었습니다!")
-        
-        # GitHub JSON 백업 파일 생성 (data 폴더에 저장)
-        self.create_github_backup(data, filename)
+        # GitHub JSON 백업 파일 갱신 (디버깅용, 요청 시에만)
+        if backup:
+            self.create_github_backup(data)
         
-        # 효율적인 구조로 Firestore에 업로드
+        # 효율적인 구조로 Firestore에 업로드 (변하지 않은 사이트의 traffic_logs는 업로드 함수에서 생략)
         upload_to_firestore_efficiently(data)
         
         return data
     
-    def create_github_backup(self, data, filename):
+    def create_github_backup(self, data):
         """
-        GitHub Actions 환경에서 data 폴더에 JSON 백업 파일을 생성합니다.
+        data 폴더의 롤링 백업 파일(live_crawling_result.json.gz)을 최신 결과로 덮어씁니다.
+        실행마다 타임스탬프 파일을 새로 만들지 않아 파일이 쌓이지 않습니다.
         """
         try:
             # data 디렉토리 생성 (없는 경우)
@@ -226,13 +408,13 @@ class LivePokerScoutCrawler:
             os.makedirs(data_dir, exist_ok=True)
             
             # GitHub 백업 파일 경로
-            github_backup_path = os.path.join(data_dir, filename)
+            github_backup_path = os.path.join(data_dir, 'live_crawling_result.json.gz')
             
-            # JSON 파일 저장
-            with open(github_backup_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 압축 JSON 저장 (indent 없이, 빠른 압축 레벨)
+            with gzip.open(github_backup_path, 'wb', compresslevel=1) as f:
+                f.write(orjson.dumps(data))
             
-            logger.info(f"🔄 GitHub 백업 파일이 생성되었습니다: {github_backup_path}")
+            logger.info(f"🔄 GitHub 백업 파일이 갱신되었습니다: {github_backup_path}")
             
             # 파일 크기와 요약 정보 로깅
             file_size = os.path.getsize(github_backup_path)
@@ -246,6 +428,6 @@ class LivePokerScoutCrawler:
 
 if __name__ == '__main__':
     crawler = LivePokerScoutCrawler()
-    crawled_data = crawler.crawl_pokerscout_data()
+    crawled_data = crawler.crawl_pokerscout_data(force_refresh=True)
     if crawled_data:
-        crawler.analyze_and_save(crawled_data)
+        crawler.analyze_and_save(crawled_data, backup='--backup' in sys.argv)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+PokerScout rankTable 행 파싱 (크롤링 CPU 핫패스)
+
+순수 Python 모듈이지만 Cython으로 그대로 컴파일할 수 있도록 분리해 두었습니다.
+    cythonize -i backend/app/services/pokerscout_rows.py
+컴파일된 확장 모듈(.so)이 있으면 같은 이름의 .py보다 먼저 import 됩니다.
+"""
+
+import logging
+import re
+from io import BytesIO
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# PokerScout rankTable 추출용 XPath (모듈 로드 시 한 번만 컴파일)
+BRAND_XPATH = etree.XPath("string((.//span[contains(concat(' ', normalize-space(@class), ' '), ' brand-title ')])[1])")
+# td 안의 첫 번째 span 텍스트 (online / peak / avg)
+SPAN_FIELD_XPATH = etree.XPath("string(((.//td[@id=$k])[1]//span)[1])")
+# td 전체 텍스트 (cash)
+TD_FIELD_XPATH = etree.XPath("string((.//td[@id=$k])[1])")
+# 사이트명 정리용 정규식 (허용: 문자, 숫자, 공백, 하이픈, 괄호, 점, &)
+_SITE_NAME_CLEAN = re.compile(r'[^\w\s\-\(\)\.&]')
+# 숫자 셀에서 제거할 문자 (천 단위 구분자, 공백)
+_COUNT_STRIP = str.maketrans('', '', ', \t\r\n\xa0')
+
+
+def parse_count(text):
+    """'1,234' 형태의 셀 텍스트를 정수로 변환 (숫자가 아니면 0)"""
+    try:
+        return max(int(text.translate(_COUNT_STRIP)), 0)
+    except ValueError:
+        return 0
+
+
+def iter_rank_rows(content):
+    """
+    rankTable의 행(tr)을 파싱되는 즉시 하나씩 반환합니다.
+    - 헤더 행(첫 번째 tr)은 건너뜀
+    - 처리가 끝난 행은 바로 비우고 트리에서 제거하여 최대 메모리 사용량을 줄임
+    - 다른 table은 닫히는 즉시 비우고, rankTable이 닫히면 나머지 페이지는 파싱하지 않음
+    """
+    rank_table = None
+    header_skipped = False
+    for event, elem in etree.iterparse(BytesIO(content), events=('start', 'end'), tag=('table', 'tr'), html=True):
+        if elem.tag == 'table':
+            if event == 'start':
+                if rank_table is None and 'rankTable' in (elem.get('class') or '').split():
+                    rank_table = elem
+            elif elem is rank_table:
+                return
+            elif rank_table is None:
+                elem.clear()
+            continue
+
+        if event != 'end' or rank_table is None:
+            continue
+        if header_skipped:
+            yield elem
+        header_skipped = True
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def extract_site_rows(content, gg_sites, collected_at):
+    """
+    PokerScout 페이지(bytes)에서 사이트별 트래픽 데이터를 추출합니다.
+    반환값: (처리한 행 수, 사이트 데이터 리스트)
+    """
+    collected_data = []
+    row_count = 0
+    for i, row in enumerate(iter_rank_rows(content)):
+        row_count += 1
+        try:
+            if 'cus_top_traffic_coin' in (row.get('class') or '').split():
+                continue
+            site_name = BRAND_XPATH(row).strip()
+            if not site_name or len(site_name) < 2:
+                continue
+
+            players_online = parse_count(SPAN_FIELD_XPATH(row, k='online'))
+            cash_players = parse_count(TD_FIELD_XPATH(row, k='cash'))
+            peak_24h = parse_count(SPAN_FIELD_XPATH(row, k='peak'))
+            seven_day_avg = parse_count(SPAN_FIELD_XPATH(row, k='avg'))
+
+            if players_online == 0 and cash_players == 0 and peak_24h == 0:
+                continue
+
+            site_name = _SITE_NAME_CLEAN.sub('', site_name).strip()
+            category = 'GG_POKER' if site_name in gg_sites else 'COMPETITOR'
+
+            collected_data.append({
+                'site_name': site_name,
+                'category': category,
+                'players_online': players_online,
+                'cash_players': cash_players,
+                'peak_24h': peak_24h,
+                'seven_day_avg': seven_day_avg,
+                'collected_at': collected_at
+            })
+        except Exception as e:
+            logger.error(f"행 {i+1} 처리 중 오류: {str(e)}")
+            continue
+    return row_count, collected_data
@@ -6,8 +6,17 @@ import sys
 import os
 import logging
 from datetime import datetime
-import json
-from tabulate import tabulate
+import orjson
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numba 미설치 시 동일한 코드를 일반 NumPy로 실행
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
 
 # 경로 설정
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,6 +28,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 리포트 표 행 형식 (컬럼 폭 고정)
+TOP_ROW_FMT = "{:>4}  {:<25}  {:>10}  {:>10}  {:>10}  {:>10}  {:>7}  {}"
+REST_ROW_FMT = "{:>4}  {:<30}  {:>10}  {:>10}  {:>10}"
+
+@njit(cache=True)
+def summarize(players, cash, peak, avg):
+    """컬럼 합계와 온라인 플레이어 내림차순 인덱스 (동점은 원래 순서 유지)"""
+    return players.sum(), cash.sum(), peak.sum(), avg.sum(), np.argsort(-players, kind='mergesort')
+
 def collect_and_display_data():
     """데이터 수집 및 상세 표시"""
     try:
@@ -41,11 +59,19 @@ def collect_and_display_data():
         print(f"수집 시간: {collection_time}")
         print("="*100)
         
-        # 전체 통계
-        total_players = sum(site['players_online'] for site in data)
-        total_cash = sum(site['cash_players'] for site in data)
-        total_peak = sum(site['peak_24h'] for site in data)
-        total_avg = sum(site['seven_day_avg'] for site in data)
+        # 숫자 컬럼을 배열(SoA)로 한 번만 변환 - 이후 합계/정렬/점유율은 벡터 연산
+        n = len(data)
+        players = np.fromiter((s['players_online'] for s in data), dtype=np.int64, count=n)
+        cash = np.fromiter((s['cash_players'] for s in data), dtype=np.int64, count=n)
+        peak = np.fromiter((s['peak_24h'] for s in data), dtype=np.int64, count=n)
+        avg = np.fromiter((s['seven_day_avg'] for s in data), dtype=np.int64, count=n)
+        is_gg = np.fromiter((s['category'] == 'GG_POKER' for s in data), dtype=bool, count=n)
+        
+        # 전체 통계 + 온라인 플레이어 기준 정렬
+        total_players, total_cash, total_peak, total_avg, order = summarize(players, cash, peak, avg)
+        total_players, total_cash = int(total_players), int(total_cash)
+        total_peak, total_avg = int(total_peak), int(total_avg)
+        shares = players * (100 / total_players) if total_players > 0 else np.zeros(n)
         
         print(f"\n[전체 시장 통계]")
         print("-"*50)
@@ -55,36 +81,30 @@ def collect_and_display_data():
         print(f"24시간 피크 합계: {total_peak:,}명")
         print(f"7일 평균 합계: {total_avg:,}명")
         
-        # 온라인 플레이어 기준 정렬
-        data_sorted = sorted(data, key=lambda x: x['players_online'], reverse=True)
+        data_sorted = [data[i] for i in order]
         
         # 상위 20개 사이트 상세 정보
         print(f"\n[상위 20개 사이트 상세 정보]")
         print("-"*100)
         
-        table_data = []
-        for i, site in enumerate(data_sorted[:20], 1):
-            # 시장 점유율 계산
-            market_share = (site['players_online'] / total_players * 100) if total_players > 0 else 0
-            
-            table_data.append([
+        print(TOP_ROW_FMT.format("순위", "사이트명", "온라인", "캐시", "24h 피크", "7일 평균", "점유율", "카테고리"))
+        for i, idx in enumerate(order[:20], 1):
+            site = data[idx]
+            print(TOP_ROW_FMT.format(
                 i,
                 site['site_name'][:25],  # 이름이 너무 길면 자르기
                 f"{site['players_online']:,}",
                 f"{site['cash_players']:,}",
                 f"{site['peak_24h']:,}",
                 f"{site['seven_day_avg']:,}",
-                f"{market_share:.1f}%",
+                f"{shares[idx]:.1f}%",
                 site['category']
-            ])
-        
-        headers = ["순위", "사이트명", "온라인", "캐시", "24h 피크", "7일 평균", "점유율", "카테고리"]
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+            ))
         
         # GG 네트워크 분석
-        gg_sites = [s for s in data if s['category'] == 'GG_POKER']
+        gg_sites = [data[i] for i in np.flatnonzero(is_gg)]
         if gg_sites:
-            gg_total = sum(s['players_online'] for s in gg_sites)
+            gg_total = int(players[is_gg].sum())
             gg_share = (gg_total / total_players * 100) if total_players > 0 else 0
             
             print(f"\n[GG 네트워크 분석]")
@@ -101,21 +121,18 @@ def collect_and_display_data():
             print(f"\n[나머지 사이트 ({len(data)-20}개)]")
             print("-"*100)
             
-            remaining_data = []
+            print(REST_ROW_FMT.format("순위", "사이트명", "온라인", "캐시", "24h 피크"))
             for i, site in enumerate(data_sorted[20:], 21):
-                remaining_data.append([
+                print(REST_ROW_FMT.format(
                     i,
                     site['site_name'][:30],
                     f"{site['players_online']:,}",
                     f"{site['cash_players']:,}",
                     f"{site['peak_24h']:,}"
-                ])
-            
-            remaining_headers = ["순위", "사이트명", "온라인", "캐시", "24h 피크"]
-            print(tabulate(remaining_data, headers=remaining_headers, tablefmt="simple"))
+                ))
         
         # 플레이어가 0인 사이트 분석
-        zero_players = [s for s in data if s['players_online'] == 0]
+        zero_players = [data[i] for i in np.flatnonzero(players == 0)]
         if zero_players:
             print(f"\n[현재 오프라인 사이트 ({len(zero_players)}개)]")
             print("-"*50)
@@ -125,21 +142,22 @@ def collect_and_display_data():
         
         # JSON 파일로 저장
         output_file = f"poker_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps({
                 'collection_time': collection_time,
                 'total_sites': len(data),
                 'total_players': total_players,
                 'total_cash_players': total_cash,
                 'sites': data_sorted
-            }, f, ensure_ascii=False, indent=2)
+            }, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         
         print(f"\n[저장 완료] 전체 데이터가 {output_file}에 저장되었습니다.")
         
         return data
         
-    except ImportError:
-        logger.error("tabulate 라이브러리가 필요합니다. 설치: pip install tabulate")
+    except ImportError as e:
+        # 크롤러 모듈이 의존하는 라이브러리(cloudscraper, bs4, google-auth 등)가 없는 경우
+        logger.error(f"필요한 라이브러리가 설치되지 않았습니다: {e.name or e}")
         return None
     except Exception as e:
         logger.error(f"데이터 표시 중 오류: {e}")
@@ -7,18 +7,27 @@
 """
 import sys
 import os
+import glob
+import gzip
+import hashlib
 import logging
 from datetime import datetime, timezone, timedelta
-import json
+import orjson
 import re
 import time
 import random
+import tempfile
+import threading
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from typing import List, Dict, Optional, Tuple
 import requests
-from bs4 import BeautifulSoup
-from google.oauth2 import service_account
-from google.auth.transport.requests import Request
-import cloudscraper
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from lxml import etree
+from lxml import html as lxml_html
+# 무거운 모듈(cloudscraper, google-auth)은 실제로 필요한 경로에서 처음 사용할 때 import
 
 # 로깅 설정
 logging.basicConfig(
@@ -29,8 +38,36 @@ logger = logging.getLogger(__name__)
 
 # Firebase 프로젝트 설정
 FIREBASE_PROJECT_ID = "poker-online-analyze"
-FIRESTORE_BASE_URL = f"https://firestore.googleapis.com/v1/projects/{FIREBASE_PROJECT_ID}/databases/(default)/documents"
+FIRESTORE_DOCUMENTS_PATH = f"projects/{FIREBASE_PROJECT_ID}/databases/(default)/documents"
+FIRESTORE_BASE_URL = f"https://firestore.googleapis.com/v1/{FIRESTORE_DOCUMENTS_PATH}"
+FIRESTORE_COMMIT_URL = f"{FIRESTORE_BASE_URL}:commit"
+# sites 컬렉션 문서 이름 접두사 (사이트명만 이어 붙여 사용)
+FIRESTORE_SITES_PREFIX = f"{FIRESTORE_DOCUMENTS_PATH}/sites/"
+# commit 요청 한 번에 포함할 사이트 수 (사이트당 쓰기 2개, Firestore 한도 500개)
+FIRESTORE_COMMIT_SITES = 250
+# 동시에 보낼 commit 요청 수 상한
+FIRESTORE_UPLOAD_WORKERS = 8
+# Firestore에 마지막으로 기록한 사이트별 (카테고리, 순위) - 바뀌지 않은 sites 문서 쓰기 생략용
+KNOWN_SITES_PATH = os.environ.get(
+    'FIRESTORE_KNOWN_SITES_PATH',
+    os.path.join(tempfile.gettempdir(), 'pokerscout_known_sites.json')
+)
 FIREBASE_REALTIME_DB_URL = "https://poker-analyzer-ggp-default-rtdb.firebaseio.com"
+# Firebase 액세스 토큰 캐시 파일 (만료 전까지 실행 간 재사용)
+ACCESS_TOKEN_CACHE_PATH = os.environ.get(
+    'FIREBASE_TOKEN_CACHE_PATH',
+    os.path.join(tempfile.gettempdir(), 'firebase_access_token.json')
+)
+# 만료 시각보다 이만큼 먼저 토큰을 갱신 (초)
+ACCESS_TOKEN_REFRESH_MARGIN = 60
+
+# Firebase 업로드 요청의 (연결 타임아웃, 읽기 타임아웃) 초 - 응답 없는 연결에 무한정 묶이지 않도록 제한
+UPLOAD_TIMEOUT = (5, 30)
+
+# orjson으로 직렬화한 bytes 본문을 보낼 때 사용하는 헤더
+JSON_HEADERS = {'Content-Type': 'application/json'}
+# urllib3가 해제할 수 있는 압축 방식만 요청 (gzip, deflate, brotli 설치 시 br)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
 
 # 알림 설정 (환경 변수에서 읽기)
 ALERT_CONFIG = {
@@ -40,44 +77,299 @@ ALERT_CONFIG = {
     'github_issue': os.environ.get('GITHUB_REPO')  # e.g., "garimto81/poker-online-analyze"
 }
 
+# PokerScout 응답 본문 최대 크기 (bytes) - 초과분은 읽지 않음
+MAX_RESPONSE_BYTES = 2_000_000
+# 마지막 성공 데이터 저장 파일 (프로세스가 재시작되어도 캐시 데이터 폴백에 사용)
+LAST_SUCCESS_PATH = os.environ.get(
+    'CRAWL_LAST_SUCCESS_PATH',
+    os.path.join(tempfile.gettempdir(), 'pokerscout_last_success.json.gz')
+)
+# crawl_with_fallback이 캐시 데이터를 반환할 때의 방법 메시지 (새 스냅샷으로 저장하지 않는 데 사용)
+CACHED_DATA_METHOD = "Cached Data 성공"
+
+# 알림 중복 방지 상태 파일 (실행 간 공유)
+ALERT_CACHE_PATH = os.environ.get('ALERT_CACHE_PATH', os.path.join(os.path.expanduser('~'), '.crawler_alert_cache.json'))
+# 동일 알림 재발송 차단 시간 (초)
+ALERT_DEDUP_WINDOW = 300
+
+# 보관할 실패 리포트(crawl_failure_*.json) 최대 개수 (오래된 것부터 삭제)
+FAILURE_REPORT_KEEP = int(os.environ.get('CRAWL_FAILURE_REPORT_KEEP', '20'))
+
+# 알림 채널 서킷 브레이커: 연속 실패 횟수가 임계값에 도달하면 일정 시간 동안 해당 채널 호출 생략
+ALERT_BREAKER_THRESHOLD = 5
+ALERT_BREAKER_COOLDOWN = 600  # 초
+
+# 헤징 요청 간격 (초): 앞선 방법이 이 시간 안에 성공하지 못하면 다음 방법을 동시에 시작
+CRAWL_HEDGE_DELAY = float(os.environ.get('CRAWL_HEDGE_DELAY', '3'))
+
+# 알림 채널(Discord/Slack/GitHub) 요청을 동시에 보내기 위한 스레드 풀
+_ALERT_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix='alert')
+
+# HTML 파싱용 정규식 (모듈 로드 시 한 번만 컴파일)
+_RANK_TABLE_CLASS = re.compile('rank', re.I)
+_DIGITS = re.compile(r'\d+')
+# 숫자 셀에서 제거할 문자 (천 단위 구분자, 공백)
+_COUNT_STRIP = str.maketrans('', '', ', \t\r\n\xa0')
+_AD_LINK_CLASS = re.compile('ad|bonus|promo', re.I)
+_RANK_NUMBER = re.compile(r'#?(\d+)')
+_RANK_CELL_CLASS = re.compile('rank|position', re.I)
+_BRAND_CLASS = re.compile('brand', re.I)
+_SITE_LINK_CLASS = re.compile('site|brand', re.I)
+# 클래스명으로 통계 셀을 찾을 때 통계별로 순서대로 시도할 일반적인 클래스명 패턴들
+_STAT_CLASS_PATTERNS = tuple(
+    (stat_name, tuple(re.compile(pattern, re.I) for pattern in (
+        stat_name, stat_name.replace('_', '-'), stat_name.split('_')[0], 'stat', 'number'
+    )))
+    for stat_name in ('players_online', 'cash_players', 'peak_24h', 'seven_day_avg')
+)
+# 사이트명(소문자)에 포함된 키워드로 카테고리 결정 (위에서부터 순서대로 검사)
+_CATEGORY_KEYWORDS = (
+    # GG Network 관련 사이트들 (더 포괄적)
+    ('GG_POKER', ('gg', 'natural8', 'betkings', 'ggasia', 'ggpoker')),
+    # 다른 주요 네트워크들
+    ('POKERSTARS', ('pokerstars', 'stars')),
+    ('WPT', ('wpt', 'world poker tour')),
+    ('PARTY_POKER', ('party', 'bwin')),
+)
+# 광고 행 판별용 키워드 정규식 (소문자 행 텍스트에서 한 번에 검색)
+# 'best bonus', 'advertisement', 'promotion'은 각각 'bonus', 'ad', 'promo'에 포함되므로 생략
+_AD_TEXT_RE = re.compile('bonus|ad|promo|sponsor|featured|coinpoker')
+# 사이트명 정리용 정규식 (허용: 문자, 숫자, 공백, 하이픈, 괄호, 점, &)
+_SITE_NAME_CLEAN = re.compile(r'[^\w\s\-\(\)\.&]')
+# 알려진 사이트명 표준화 (소문자 이름 -> 표준 표기, 순서대로 부분 문자열 검사)
+_SITE_NAME_STANDARDIZATIONS = {
+    'gg poker': 'GGPoker',
+    'ggpoker on': 'GGPoker ON',
+    'wpt global': 'WPT Global',
+    'pokerstars': 'PokerStars',
+    'party poker': 'partypoker',
+    '888 poker': '888poker'
+}
+# 알려진 포커 사이트 패턴들 (사이트명 추출의 마지막 수단, 하나의 정규식으로 합쳐 한 번에 검색)
+_POKER_SITE_RE = re.compile('|'.join((
+    r'PokerStars?', r'GGPoker(?:\s+ON)?', r'WPT\s+Global?',
+    r'partypoker', r'888poker', r'BetMGM', r'Natural8',
+    r'CoinPoker', r'Ignition', r'BetOnline', r'Americas Cardroom',
+    r'Bodog', r'SportsBetting', r'Bovada', r'WSOP'
+)), re.I)
+# 통계 이름과 PokerScout 셀 id
+_STAT_CELL_IDS = (
+    ('players_online', 'online'),
+    ('cash_players', 'cash'),
+    ('peak_24h', 'peak'),
+    ('seven_day_avg', 'avg')
+)
+
+# PokerScout 페이지 파싱용 lxml 파서와 XPath (모듈 로드 시 한 번만 생성/컴파일)
+_LXML_PARSER = lxml_html.HTMLParser(encoding='utf-8')  # PokerScout는 UTF-8로 응답
+_RANK_TABLE_XPATH = etree.XPath("(//table[contains(concat(' ', normalize-space(@class), ' '), ' rankTable ')])[1]")
+_TABLE_XPATH = etree.XPath("//table")
+_ROW_XPATH = etree.XPath(".//tr")
+_TD_XPATH = etree.XPath(".//td")
+_LINK_XPATH = etree.XPath(".//a")
+_SPAN_XPATH = etree.XPath("(.//span)[1]")
+_BRAND_TITLE_XPATH = etree.XPath("(.//span[contains(concat(' ', normalize-space(@class), ' '), ' brand-title ')])[1]")
+
+def _element_text(element, strip: bool = True) -> str:
+    """요소의 텍스트 추출 (strip=True면 각 문자열의 앞뒤 공백을 제거하여 연결, 주석은 제외)"""
+    if strip:
+        return ''.join(text.strip() for text in element.itertext())
+    return ''.join(element.itertext())
+
+def _element_classes(element) -> List[str]:
+    """요소의 class 속성을 목록으로 반환"""
+    return (element.get('class') or '').split()
+
+def _find_by_class(element, tag: str, pattern):
+    """class 중 하나가 정규식과 일치하는 첫 번째 하위 요소 (없으면 None)"""
+    return next(
+        (child for child in element.iterdescendants(tag)
+         if any(pattern.search(c) for c in _element_classes(child))),
+        None
+    )
+
+# 재시도할 HTTP 상태 코드 (요청 과다 / 일시적인 서버 오류)
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+# Retry-After 헤더로 요청받은 대기 시간의 상한 (초)
+RETRY_AFTER_MAX = 60.0
+
+def _retry_after_seconds(response) -> float:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return 0.0
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return 0.0
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+def _retry(fn, attempts: int = 3, base: float = 0.5, cap: float = 8.0, stop_event: threading.Event = None):
+    """
+    HTTP 요청 재시도 (지수 백오프 + full jitter, Retry-After 헤더 반영)
+    - fn: requests.Response를 반환하는 함수
+    - requests 예외나 429/5xx 응답이면 재시도, 마지막 시도의 결과는 그대로 반환(예외는 전파)
+    - stop_event가 설정되면 대기를 중단하고 마지막 결과를 반환
+    """
+    for attempt in range(attempts):
+        response, error = None, None
+        try:
+            response = fn()
+            if response.status_code not in RETRYABLE_STATUS:
+                return response
+        except requests.RequestException as e:
+            error = e
+        
+        if attempt == attempts - 1:
+            break
+        if response is not None:
+            response.close()
+        
+        delay = min(cap, base * 2 ** attempt) * random.random() + _retry_after_seconds(response)
+        logger.info(f"재시도 전 {delay:.1f}초 대기... ({attempt + 1}/{attempts})")
+        if stop_event is not None:
+            if stop_event.wait(delay):
+                break
+        else:
+            time.sleep(delay)
+    
+    if error is not None:
+        raise error
+    return response
+
+def _create_http_session() -> requests.Session:
+    """keep-alive 커넥션 풀을 사용하는 requests 세션 생성 (재시도는 _retry에서 처리)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def _read_body(response) -> bytes:
+    """
+    stream=True 응답의 본문을 압축 해제하며 최대 MAX_RESPONSE_BYTES까지만 읽어 bytes로 반환
+    (str 디코딩 없이 파서에 바로 전달)
+    """
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_RESPONSE_BYTES:
+                logger.warning(f"응답 본문이 {MAX_RESPONSE_BYTES:,} bytes를 초과하여 나머지는 읽지 않습니다")
+                break
+    finally:
+        response.close()
+    return b''.join(chunks)[:MAX_RESPONSE_BYTES]
+
 class AlertSystem:
     """다양한 채널로 알림을 보내는 시스템"""
     
     def __init__(self):
-        self.alerts_sent = []
-        self.last_alert_time = None
+        # {알림 키: 마지막 발송 시각(epoch)} - 다음 실행에서도 중복 알림을 막기 위해 파일에 저장
+        self.alerts_sent = self._load_alert_cache()
+        # 웹훅/GitHub API 요청이 커넥션을 재사용하도록 세션 공유
+        self.session = _create_http_session()
+        # 채널별 서킷 브레이커 상태 (연속 실패 횟수, 차단 해제 시각)
+        self._breakers = {
+            channel: {'fails': 0, 'open_until': 0.0}
+            for channel in ('discord', 'slack', 'github')
+        }
+        
+    def _load_alert_cache(self) -> Dict[str, float]:
+        """저장된 알림 발송 기록 로드 (차단 시간이 지난 항목은 제외)"""
+        try:
+            with open(ALERT_CACHE_PATH, 'rb') as f:
+                cache = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        
+        if not isinstance(cache, dict):
+            return {}
+        now = time.time()
+        # 손상되었거나 직접 수정된 파일의 숫자가 아닌 값은 버림 (초기화 중 TypeError 방지)
+        return {
+            key: sent_at for key, sent_at in cache.items()
+            if isinstance(sent_at, (int, float)) and now - sent_at < ALERT_DEDUP_WINDOW
+        }
+    
+    def _save_alert_cache(self):
+        """알림 발송 기록 저장 (임시 파일에 쓴 뒤 교체하여 원자적으로 저장)"""
+        tmp_path = f"{ALERT_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(self.alerts_sent))
+            os.replace(tmp_path, ALERT_CACHE_PATH)
+        except OSError as e:
+            logger.warning(f"알림 캐시 저장 실패: {e}")
         
     def send_alert(self, title: str, message: str, level: str = "ERROR", details: Dict = None):
         """모든 설정된 채널로 알림 발송"""
         # 중복 알림 방지 (5분 이내 동일 알림 차단)
         alert_key = f"{title}:{level}"
-        current_time = datetime.now()
+        now = time.time()
+        
+        if now - self.alerts_sent.get(alert_key, 0) < ALERT_DEDUP_WINDOW:
+            logger.info(f"알림 스킵 (최근 발송됨): {title}")
+            return
         
-        if self.last_alert_time:
-            time_diff = (current_time - self.last_alert_time).seconds
-            if time_diff < 300 and alert_key in self.alerts_sent:  # 5분
-                logger.info(f"알림 스킵 (최근 발송됨): {title}")
-                return
+        # 차단 시간이 지난 항목은 정리하여 기록이 무한히 커지지 않도록 유지
+        self.alerts_sent = {
+            key: sent_at for key, sent_at in self.alerts_sent.items() if now - sent_at < ALERT_DEDUP_WINDOW
+        }
+        self.alerts_sent[alert_key] = now
+        self._save_alert_cache()
         
-        self.last_alert_time = current_time
-        self.alerts_sent.append(alert_key)
+        # 설정된 채널 요청을 동시에 전송 (전체 지연 = 가장 느린 채널)
+        futures = []
         
         # Discord 알림
         if ALERT_CONFIG.get('discord_webhook'):
-            self._send_discord_alert(title, message, level, details)
+            futures.append(_ALERT_EXECUTOR.submit(
+                self._call_with_breaker, 'discord', self._send_discord_alert, title, message, level, details
+            ))
         
         # Slack 알림
         if ALERT_CONFIG.get('slack_webhook'):
-            self._send_slack_alert(title, message, level, details)
+            futures.append(_ALERT_EXECUTOR.submit(
+                self._call_with_breaker, 'slack', self._send_slack_alert, title, message, level, details
+            ))
         
         # GitHub Issue 생성
         if ALERT_CONFIG.get('github_issue') and level == "CRITICAL":
-            self._create_github_issue(title, message, details)
+            futures.append(_ALERT_EXECUTOR.submit(
+                self._call_with_breaker, 'github', self._create_github_issue, title, message, details
+            ))
         
         # 콘솔 출력 (GitHub Actions 로그)
         self._log_to_console(title, message, level, details)
+        
+        # 각 채널 함수가 자체적으로 예외를 로깅하므로 완료만 기다림
+        wait(futures)
     
-    def _send_discord_alert(self, title: str, message: str, level: str, details: Dict):
+    def _call_with_breaker(self, channel: str, send_func, *args):
+        """서킷 브레이커가 열려 있으면 호출을 생략하고, 결과에 따라 연속 실패 횟수 갱신"""
+        breaker = self._breakers[channel]
+        now = time.time()
+        if now < breaker['open_until']:
+            logger.info(f"{channel} 알림 생략 (서킷 브레이커 열림, {breaker['open_until'] - now:.0f}초 남음)")
+            return
+        
+        if send_func(*args):
+            breaker['fails'] = 0
+            return
+        
+        breaker['fails'] += 1
+        if breaker['fails'] >= ALERT_BREAKER_THRESHOLD:
+            breaker['open_until'] = now + ALERT_BREAKER_COOLDOWN
+            breaker['fails'] = 0
+            logger.warning(f"{channel} 알림 {ALERT_BREAKER_THRESHOLD}회 연속 실패 - {ALERT_BREAKER_COOLDOWN}초 동안 호출 중단")
+    
+    def _send_discord_alert(self, title: str, message: str, level: str, details: Dict) -> bool:
         """Discord 웹훅으로 알림 발송"""
         try:
             color = {
@@ -104,21 +396,23 @@ class AlertSystem:
                     })
             
             payload = {"embeds": [embed]}
-            response = requests.post(
+            response = self.session.post(
                 ALERT_CONFIG['discord_webhook'],
-                json=payload,
+                data=orjson.dumps(payload),
+                headers=JSON_HEADERS,
                 timeout=10
             )
             
             if response.status_code == 204:
                 logger.info("Discord 알림 발송 성공")
-            else:
-                logger.warning(f"Discord 알림 실패: {response.status_code}")
+                return True
+            logger.warning(f"Discord 알림 실패: {response.status_code}")
                 
         except Exception as e:
             logger.error(f"Discord 알림 발송 중 오류: {e}")
+        return False
     
-    def _send_slack_alert(self, title: str, message: str, level: str, details: Dict):
+    def _send_slack_alert(self, title: str, message: str, level: str, details: Dict) -> bool:
         """Slack 웹훅으로 알림 발송"""
         try:
             blocks = [
@@ -151,26 +445,28 @@ class AlertSystem:
                 })
             
             payload = {"blocks": blocks}
-            response = requests.post(
+            response = self.session.post(
                 ALERT_CONFIG['slack_webhook'],
-                json=payload,
+                data=orjson.dumps(payload),
+                headers=JSON_HEADERS,
                 timeout=10
             )
             
             if response.status_code == 200:
                 logger.info("Slack 알림 발송 성공")
-            else:
-                logger.warning(f"Slack 알림 실패: {response.status_code}")
+                return True
+            logger.warning(f"Slack 알림 실패: {response.status_code}")
                 
         except Exception as e:
             logger.error(f"Slack 알림 발송 중 오류: {e}")
+        return False
     
-    def _create_github_issue(self, title: str, message: str, details: Dict):
+    def _create_github_issue(self, title: str, message: str, details: Dict) -> bool:
         """GitHub Issue 자동 생성 (Critical 에러만)"""
         try:
             if not os.environ.get('GITHUB_TOKEN'):
                 logger.warning("GitHub Token이 설정되지 않아 Issue를 생성할 수 없습니다.")
-                return
+                return False
             
             repo = ALERT_CONFIG['github_issue']
             url = f"https://api.github.com/repos/{repo}/issues"
@@ -186,7 +482,8 @@ class AlertSystem:
             
             headers = {
                 "Authorization": f"token {os.environ.get('GITHUB_TOKEN')}",
-                "Accept": "application/vnd.github.v3+json"
+                "Accept": "application/vnd.github.v3+json",
+                **JSON_HEADERS
             }
             
             payload = {
@@ -195,16 +492,17 @@ class AlertSystem:
                 "labels": ["bug", "automated", "crawler-issue"]
             }
             
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            response = self.session.post(url, data=orjson.dumps(payload), headers=headers, timeout=10)
             
             if response.status_code == 201:
                 issue_url = response.json().get('html_url')
                 logger.info(f"GitHub Issue 생성됨: {issue_url}")
-            else:
-                logger.warning(f"GitHub Issue 생성 실패: {response.status_code}")
+                return True
+            logger.warning(f"GitHub Issue 생성 실패: {response.status_code}")
                 
         except Exception as e:
             logger.error(f"GitHub Issue 생성 중 오류: {e}")
+        return False
     
     def _log_to_console(self, title: str, message: str, level: str, details: Dict):
         """콘솔에 구조화된 알림 출력 (GitHub Actions 로그용)"""
@@ -225,40 +523,93 @@ class RobustPokerScoutCrawler:
     
     def __init__(self):
         self.alert_system = AlertSystem()
-        self.scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'mobile': False}
-        )
+        # CloudScraper 세션은 처음 사용할 때 생성 (scraper 속성)
+        self._scraper = None
+        self._scraper_lock = threading.Lock()
         self.gg_poker_sites = [
             'GGNetwork', 'GGPoker ON', 'GG Poker', 'GGPoker', 
             'GG Network', 'GGPoker.com', 'GG', 'Natural8',
             'GGPoker Global', 'GGPoker EU', 'BetKings', 'GGasia'
         ]
+        # 일반 requests 방법들이 공유하는 세션 (User-Agent를 바꿔도 TLS 연결 재사용)
+        self.session = _create_http_session()
         self.retry_count = 3
         self.timeout = 30
-        self.last_successful_data = None
-        self.last_successful_time = None
+        self.last_successful_data, self.last_successful_time = self._load_last_success()
+        # 캐시 경과 시간 계산용 monotonic 시각 (시스템 시계 변경에 영향받지 않음)
+        # 디스크에서 불러온 데이터는 로드 시점에 한 번만 벽시계 기준 경과 시간을 환산
+        self.last_successful_mono = None
+        if self.last_successful_time:
+            saved_age = max((datetime.now() - self.last_successful_time).total_seconds(), 0.0)
+            self.last_successful_mono = time.monotonic() - saved_age
+        # 한 방법이 성공하면 설정되어 나머지 방법의 재시도/대기를 중단시킴
+        self._stop_event = threading.Event()
+        # 마지막으로 파싱한 페이지 (본문 해시, ETag, Last-Modified, 파싱 결과)
+        # 헤징된 방법들이 동시에 갱신할 수 있으므로 튜플 하나로 통째로 교체
+        self._page_cache = (None, None, None, [])
         
     def crawl_with_fallback(self) -> Tuple[bool, List[Dict], str]:
-        """다중 폴백 메커니즘으로 크롤링 시도"""
+        """
+        다중 폴백 메커니즘으로 크롤링 시도 (헤징 요청)
+        - CloudScraper를 먼저 시작하고, 앞선 방법이 CRAWL_HEDGE_DELAY초 안에 끝나지 않으면 다음 방법을 동시에 시작
+        - 앞선 방법이 그보다 먼저 실패하면 다음 방법을 바로 시작
+        - 가장 먼저 성공한 결과를 사용하고 나머지는 중단
+        - 세 방법이 모두 실패한 경우에만 캐시 데이터 사용
+        """
         methods = [
             ("CloudScraper", self._crawl_with_cloudscraper),
             ("Regular Requests", self._crawl_with_requests),
-            ("Different Headers", self._crawl_with_custom_headers),
-            ("Cached Data", self._use_cached_data)
+            ("Different Headers", self._crawl_with_custom_headers)
         ]
+        self._stop_event.clear()
+        # 각 방법의 시작/종료 신호 (다음 방법의 시작 시점 결정용)
+        started = [threading.Event() for _ in methods]
+        finished = [threading.Event() for _ in methods]
         
-        for method_name, method_func in methods:
-            logger.info(f"크롤링 시도: {method_name}")
-            
+        def run_method(index, method_name, method_func):
             try:
+                if index > 0:
+                    # 앞선 방법이 시작된 뒤 CRAWL_HEDGE_DELAY초가 지나거나 그 전에 끝나면 시작
+                    started[index - 1].wait()
+                    finished[index - 1].wait(CRAWL_HEDGE_DELAY)
+                # 대기 중에 앞선 방법이 성공하면 시작하지 않음
+                if self._stop_event.is_set():
+                    return False, [], "다른 방법이 먼저 성공하여 취소됨"
+                started[index].set()
+                logger.info(f"크롤링 시도: {method_name}")
                 success, data, message = method_func()
+                if success and data:
+                    # 다음 방법이 종료 신호를 받기 전에 중단 신호를 먼저 설정
+                    self._stop_event.set()
+                return success, data, message
+            finally:
+                started[index].set()
+                finished[index].set()
+        
+        executor = ThreadPoolExecutor(max_workers=len(methods))
+        futures = {
+            executor.submit(run_method, i, method_name, method_func): method_name
+            for i, (method_name, method_func) in enumerate(methods)
+        }
+        
+        try:
+            for future in as_completed(futures):
+                method_name = futures[future]
+                try:
+                    success, data, message = future.result()
+                except Exception as e:
+                    logger.error(f"❌ {method_name} 예외 발생: {str(e)}")
+                    continue
                 
                 if success and data:
+                    self._stop_event.set()
                     logger.info(f"✅ {method_name} 성공: {len(data)}개 사이트")
                     
                     # 성공 시 캐시 업데이트
                     self.last_successful_data = data
                     self.last_successful_time = datetime.now()
+                    self.last_successful_mono = time.monotonic()
+                    self._save_last_success()
                     
                     # 이전에 실패했다가 복구된 경우 알림
                     if hasattr(self, '_was_failing') and self._was_failing:
@@ -273,46 +624,63 @@ class RobustPokerScoutCrawler:
                     return True, data, f"{method_name} 성공"
                 else:
                     logger.warning(f"❌ {method_name} 실패: {message}")
-                    
-            except Exception as e:
-                logger.error(f"❌ {method_name} 예외 발생: {str(e)}")
-                continue
+        finally:
+            self._stop_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        # 실시간 크롤링이 모두 실패하면 캐시 데이터 사용
+        logger.info("크롤링 시도: Cached Data")
+        success, data, message = self._use_cached_data()
+        if success and data:
+            return True, data, CACHED_DATA_METHOD
+        logger.warning(f"❌ Cached Data 실패: {message}")
         
         # 모든 방법 실패
         self._was_failing = True
         self._handle_complete_failure()
         return False, [], "모든 크롤링 방법 실패"
     
+    @property
+    def scraper(self):
+        """CloudScraper 세션 (첫 사용 시 cloudscraper를 import하여 생성)"""
+        with self._scraper_lock:
+            if self._scraper is None:
+                import cloudscraper
+                self._scraper = cloudscraper.create_scraper(
+                    browser={'browser': 'chrome', 'platform': 'windows', 'mobile': False}
+                )
+            return self._scraper
+    
     def _crawl_with_cloudscraper(self) -> Tuple[bool, List[Dict], str]:
         """CloudScraper를 사용한 크롤링 (기본 방법)"""
-        for attempt in range(self.retry_count):
-            try:
-                # 요청 간 랜덤 지연
-                if attempt > 0:
-                    delay = random.uniform(2, 5)
-                    logger.info(f"재시도 전 {delay:.1f}초 대기...")
-                    time.sleep(delay)
-                
-                response = self.scraper.get(
+        try:
+            response = _retry(
+                lambda: self.scraper.get(
                     'https://www.pokerscout.com',
-                    timeout=self.timeout
-                )
-                
-                if response.status_code == 200:
-                    data = self._parse_html(response.text)
-                    if data:
-                        return True, data, "성공"
-                    else:
-                        logger.warning("HTML 파싱 실패 - 페이지 구조 변경 가능성")
-                elif response.status_code == 403:
-                    return False, [], "403 Forbidden - 차단됨"
-                else:
-                    logger.warning(f"HTTP {response.status_code}")
-                    
-            except Exception as e:
-                logger.error(f"CloudScraper 시도 {attempt+1} 실패: {e}")
+                    headers={'Accept-Encoding': ACCEPT_ENCODING, **self._conditional_headers()},
+                    timeout=self.timeout,
+                    stream=True
+                ),
+                attempts=self.retry_count,
+                stop_event=self._stop_event
+            )
+        except Exception as e:
+            logger.error(f"CloudScraper 요청 실패: {e}")
+            return False, [], "CloudScraper 모든 시도 실패"
         
-        return False, [], "CloudScraper 모든 시도 실패"
+        # 403/기타 상태/파싱 실패 경로에서도 stream=True 커넥션을 풀에 반납하도록 항상 닫음
+        with response:
+            if response.status_code in (200, 304):
+                data = self._parse_response(response)
+                if data:
+                    return True, data, "성공"
+                logger.warning("HTML 파싱 실패 - 페이지 구조 변경 가능성")
+                return False, [], "HTML 파싱 실패"
+            elif response.status_code == 403:
+                return False, [], "403 Forbidden - 차단됨"
+            
+            logger.warning(f"HTTP {response.status_code}")
+            return False, [], f"HTTP {response.status_code}"
     
     def _crawl_with_requests(self) -> Tuple[bool, List[Dict], str]:
         """일반 requests 라이브러리 사용"""
@@ -320,26 +688,30 @@ class RobustPokerScoutCrawler:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': ACCEPT_ENCODING,
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         }
         
         try:
-            session = requests.Session()
-            response = session.get(
-                'https://www.pokerscout.com',
-                headers=headers,
-                timeout=self.timeout
+            response = _retry(
+                lambda: self.session.get(
+                    'https://www.pokerscout.com',
+                    headers={**headers, **self._conditional_headers()},
+                    timeout=self.timeout,
+                    stream=True
+                ),
+                stop_event=self._stop_event
             )
             
-            if response.status_code == 200:
-                data = self._parse_html(response.text)
-                if data:
-                    return True, data, "성공"
-            
-            return False, [], f"HTTP {response.status_code}"
+            with response:
+                if response.status_code in (200, 304):
+                    data = self._parse_response(response)
+                    if data:
+                        return True, data, "성공"
+                
+                return False, [], f"HTTP {response.status_code}"
             
         except Exception as e:
             return False, [], str(e)
@@ -353,35 +725,103 @@ class RobustPokerScoutCrawler:
         ]
         
         for ua in user_agents:
+            if self._stop_event.is_set():
+                break
             try:
                 headers = {
                     'User-Agent': ua,
                     'Accept': '*/*',
+                    'Accept-Encoding': ACCEPT_ENCODING,
                     'Cache-Control': 'no-cache',
                     'Pragma': 'no-cache'
                 }
                 
-                response = requests.get(
-                    'https://www.pokerscout.com',
-                    headers=headers,
-                    timeout=self.timeout
+                response = _retry(
+                    lambda: self.session.get(
+                        'https://www.pokerscout.com',
+                        headers={**headers, **self._conditional_headers()},
+                        timeout=self.timeout,
+                        stream=True
+                    ),
+                    stop_event=self._stop_event
                 )
                 
-                if response.status_code == 200:
-                    data = self._parse_html(response.text)
-                    if data:
-                        return True, data, f"성공 (UA: {ua[:30]}...)"
+                with response:
+                    if response.status_code in (200, 304):
+                        data = self._parse_response(response)
+                        if data:
+                            return True, data, f"성공 (UA: {ua[:30]}...)"
                         
             except Exception as e:
                 continue
         
         return False, [], "모든 User-Agent 실패"
     
+    def _conditional_headers(self) -> Dict[str, str]:
+        """마지막으로 파싱한 페이지 기준 조건부 요청 헤더 (변경이 없으면 서버가 304 응답)"""
+        _, etag, last_modified, data = self._page_cache
+        headers = {}
+        if data:
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    def _parse_response(self, response) -> List[Dict]:
+        """
+        응답을 파싱하되, 마지막으로 파싱한 페이지와 같으면 이전 결과를 재사용
+        - 304 Not Modified: 본문 없이 이전 결과 반환
+        - 본문 해시가 같으면 HTML 파싱 생략
+        """
+        content_hash, _, _, cached_data = self._page_cache
+        if response.status_code == 304:
+            response.close()
+            logger.info("페이지 변경 없음 (304) - 이전 파싱 결과 사용")
+            return cached_data
+        
+        body = _read_body(response)
+        body_hash = hashlib.blake2b(body, digest_size=16).digest()
+        if body_hash == content_hash and cached_data:
+            logger.info("이전과 동일한 페이지 - 이전 파싱 결과 사용")
+            return cached_data
+        
+        data = self._parse_html(body)
+        if data:
+            self._page_cache = (
+                body_hash,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                data
+            )
+        return data
+    
+    def _load_last_success(self) -> Tuple[Optional[List[Dict]], Optional[datetime]]:
+        """디스크에 저장된 마지막 성공 데이터 로드 (없으면 None, None)"""
+        try:
+            with gzip.open(LAST_SUCCESS_PATH, 'rb') as f:
+                saved = orjson.loads(f.read())
+            return saved['data'], datetime.fromisoformat(saved['time'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, None
+    
+    def _save_last_success(self):
+        """마지막 성공 데이터를 gzip JSON으로 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = f"{LAST_SUCCESS_PATH}.{os.getpid()}.tmp"
+        try:
+            with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+                f.write(orjson.dumps({
+                    'time': self.last_successful_time.isoformat(),
+                    'data': self.last_successful_data
+                }))
+            os.replace(tmp_path, LAST_SUCCESS_PATH)
+        except OSError as e:
+            logger.warning(f"마지막 성공 데이터 저장 실패: {e}")
+    
     def _use_cached_data(self) -> Tuple[bool, List[Dict], str]:
         """마지막 성공한 데이터 사용 (비상용)"""
-        if self.last_successful_data and self.last_successful_time:
-            time_diff = datetime.now() - self.last_successful_time
-            hours_old = time_diff.total_seconds() / 3600
+        if self.last_successful_data and self.last_successful_mono is not None:
+            hours_old = (time.monotonic() - self.last_successful_mono) / 3600
             
             if hours_old < 24:  # 24시간 이내 데이터만 사용
                 logger.warning(f"⚠️ {hours_old:.1f}시간 전 캐시 데이터 사용")
@@ -401,82 +841,43 @@ class RobustPokerScoutCrawler:
         
         return False, [], "사용 가능한 캐시 없음"
     
-    def _parse_html(self, html_content: str) -> List[Dict]:
-        """HTML 파싱 로직"""
+    def _parse_html(self, html_content: bytes) -> List[Dict]:
+        """HTML 파싱 로직 (lxml로 직접 파싱하고 컴파일된 XPath로 탐색)"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 다양한 방법으로 테이블 찾기
-            table = soup.find('table', {'class': 'rankTable'})
-            
-            if not table:
-                # 대체 선택자 시도
-                table = soup.find('table', class_=re.compile('rank', re.I))
-            
-            if not table:
-                tables = soup.find_all('table')
-                if tables:
-                    table = tables[0]  # 첫 번째 테이블 사용
-                    logger.warning(f"rankTable을 찾을 수 없어 첫 번째 테이블 사용 (총 {len(tables)}개)")
-            
-            if not table:
-                logger.error("테이블을 찾을 수 없음")
-                return []
+            records = self._rank_table_records(html_content)
             
             collected_data = []
-            rows = table.find_all('tr')[1:]  # 헤더 제외
+            # 한 번의 크롤링에서 수집된 모든 행은 같은 수집 시각을 공유
+            collected_at = datetime.now(timezone.utc).isoformat()
             
-            for row in rows:
-                try:
-                    # 광고 행이나 특별 행 스킵
-                    if self._is_advertisement_row(row):
-                        logger.debug("광고 행 스킵됨")
-                        continue
-                    
-                    # 순위 번호 추출
-                    rank = self._extract_rank(row)
-                    
-                    # 사이트 이름 추출 (여러 방법 시도)
-                    site_name = self._extract_site_name(row)
-                    
-                    if not site_name or len(site_name) < 2:
-                        logger.debug(f"사이트명 추출 실패, 행 스킵: {site_name}")
-                        continue
-                    
-                    # WPT Global, GGPoker ON 등 특정 사이트 확인
-                    if 'WPT' in site_name or 'GGPoker ON' in site_name:
-                        logger.info(f"주요 사이트 감지: {site_name}")
-                    
-                    # 통계 추출
-                    stats = self._extract_stats(row)
-                    
-                    if stats['players_online'] == 0 and stats['cash_players'] == 0 and stats['peak_24h'] == 0:
-                        continue
-                    
-                    # 사이트명 정리
-                    site_name = self._clean_site_name(site_name)
-                    
-                    # 카테고리 결정 (더 포괄적인 매칭)
-                    category = self._determine_category(site_name)
-                    
-                    collected_data.append({
-                        'rank': rank,
-                        'site_name': site_name,
-                        'category': category,
-                        'players_online': stats['players_online'],
-                        'cash_players': stats['cash_players'],
-                        'peak_24h': stats['peak_24h'],
-                        'seven_day_avg': stats['seven_day_avg'],
-                        'collected_at': datetime.now(timezone.utc).isoformat()
-                    })
-                    
-                    # 주요 사이트 로그
-                    if category == 'GG_POKER' or 'WPT' in site_name:
-                        logger.info(f"#{rank} {site_name}: {stats['players_online']:,}명 온라인 ({category})")
-                    
-                except Exception as e:
-                    logger.debug(f"행 파싱 오류: {e}")
+            for rank, site_name, stats in records:
+                # WPT Global, GGPoker ON 등 특정 사이트 확인
+                if 'WPT' in site_name or 'GGPoker ON' in site_name:
+                    logger.info(f"주요 사이트 감지: {site_name}")
+                
+                if stats['players_online'] == 0 and stats['cash_players'] == 0 and stats['peak_24h'] == 0:
                     continue
+                
+                # 사이트명 정리
+                site_name = self._clean_site_name(site_name)
+                
+                # 카테고리 결정 (더 포괄적인 매칭)
+                category = self._determine_category(site_name)
+                
+                collected_data.append({
+                    'rank': rank,
+                    'site_name': site_name,
+                    'category': category,
+                    'players_online': stats['players_online'],
+                    'cash_players': stats['cash_players'],
+                    'peak_24h': stats['peak_24h'],
+                    'seven_day_avg': stats['seven_day_avg'],
+                    'collected_at': collected_at
+                })
+                
+                # 주요 사이트 로그
+                if category == 'GG_POKER' or 'WPT' in site_name:
+                    logger.info(f"#{rank} {site_name}: {stats['players_online']:,}명 온라인 ({category})")
             
             return collected_data
             
@@ -484,7 +885,68 @@ class RobustPokerScoutCrawler:
             logger.error(f"HTML 파싱 실패: {e}")
             return []
     
-    def _extract_stats(self, row) -> Dict[str, int]:
+    def _find_rank_table(self, tree):
+        """다양한 방법으로 순위 테이블 찾기"""
+        tables = _RANK_TABLE_XPATH(tree)
+        if tables:
+            return tables[0]
+        
+        # 대체 선택자 시도
+        all_tables = _TABLE_XPATH(tree)
+        table = next(
+            (t for t in all_tables if any(_RANK_TABLE_CLASS.search(c) for c in _element_classes(t))),
+            None
+        )
+        if table is not None:
+            return table
+        
+        if all_tables:
+            logger.warning(f"rankTable을 찾을 수 없어 첫 번째 테이블 사용 (총 {len(all_tables)}개)")
+            return all_tables[0]  # 첫 번째 테이블 사용
+        
+        return None
+    
+    def _rank_table_records(self, html_content: bytes) -> List[Tuple[int, str, Dict[str, int]]]:
+        """순위 테이블의 행마다 여러 추출 방법을 시도하여 (순위, 사이트명, 통계) 추출"""
+        table = self._find_rank_table(lxml_html.fromstring(html_content, parser=_LXML_PARSER))
+        if table is None:
+            logger.error("테이블을 찾을 수 없음")
+            return []
+        
+        # 스크립트/스타일 텍스트는 셀 텍스트에 포함하지 않음
+        etree.strip_elements(table, 'script', 'style', with_tail=False)
+        
+        records = []
+        for row in _ROW_XPATH(table)[1:]:  # 헤더 제외
+            try:
+                # 행의 셀 목록은 한 번만 수집하여 각 추출 함수에서 재사용
+                tds = _TD_XPATH(row)
+                
+                # 광고 행이나 특별 행 스킵
+                if self._is_advertisement_row(row, tds):
+                    logger.debug("광고 행 스킵됨")
+                    continue
+                
+                # 순위 번호 추출
+                rank = self._extract_rank(row, tds)
+                
+                # 사이트 이름 추출 (여러 방법 시도)
+                site_name = self._extract_site_name(row, tds)
+                
+                if not site_name or len(site_name) < 2:
+                    logger.debug(f"사이트명 추출 실패, 행 스킵: {site_name}")
+                    continue
+                
+                # 통계 추출
+                records.append((rank, site_name, self._extract_stats(row, tds)))
+                
+            except Exception as e:
+                logger.debug(f"행 파싱 오류: {e}")
+                continue
+        
+        return records
+    
+    def _extract_stats(self, row, tds) -> Dict[str, int]:
         """테이블 행에서 통계 추출 (여러 방법 시도)"""
         stats = {
             'players_online': 0,
@@ -494,25 +956,27 @@ class RobustPokerScoutCrawler:
         }
         
         try:
-            # 방법 1: ID로 찾기
-            for stat_name, td_id in [
-                ('players_online', 'online'),
-                ('cash_players', 'cash'),
-                ('peak_24h', 'peak'),
-                ('seven_day_avg', 'avg')
-            ]:
-                td = row.find('td', {'id': td_id})
-                if td:
+            # 방법 1: ID로 찾기 (같은 id가 여러 개면 첫 번째 셀)
+            cells_by_id = {}
+            for td in tds:
+                td_id = td.get('id')
+                if td_id:
+                    cells_by_id.setdefault(td_id, td)
+            
+            for stat_name, td_id in _STAT_CELL_IDS:
+                td = cells_by_id.get(td_id)
+                if td is not None:
                     # span 태그 확인
-                    span = td.find('span')
-                    text = span.get_text(strip=True) if span else td.get_text(strip=True)
-                    text = text.replace(',', '')
-                    if text.isdigit():
-                        stats[stat_name] = int(text)
+                    span = _SPAN_XPATH(td)
+                    text = _element_text(span[0] if span else td)
+                    try:
+                        # 부호가 붙은 값('-5', '+5')도 int()는 받아들이므로 음수는 0으로 처리
+                        stats[stat_name] = max(int(text.translate(_COUNT_STRIP)), 0)
+                    except ValueError:
+                        pass
             
             # 방법 2: 순서로 추출 (ID로 찾기 실패 시)
             if all(v == 0 for v in stats.values()):
-                tds = row.find_all('td')
                 if len(tds) >= 6:  # 순위, 사이트명, 온라인, 캐시, 피크, 평균
                     stat_indices = [2, 3, 4, 5]  # 온라인, 캐시, 피크, 평균 순서
                     stat_names = ['players_online', 'cash_players', 'peak_24h', 'seven_day_avg']
@@ -520,28 +984,27 @@ class RobustPokerScoutCrawler:
                     for i, stat_name in enumerate(stat_names):
                         if stat_indices[i] < len(tds):
                             td = tds[stat_indices[i]]
-                            text = td.get_text(strip=True).replace(',', '')
-                            # 숫자만 추출
-                            numbers = re.findall(r'\d+', text)
-                            if numbers:
-                                stats[stat_name] = int(numbers[0])
+                            text = _element_text(td).translate(_COUNT_STRIP)
+                            # 첫 번째 숫자만 추출
+                            number = _DIGITS.search(text)
+                            if number:
+                                stats[stat_name] = int(number.group())
             
-            # 방법 3: 클래스명으로 찾기
+            # 방법 3: 클래스명으로 찾기 (셀별 class 목록은 한 번만 수집)
             if all(v == 0 for v in stats.values()):
-                for stat_name in ['players_online', 'cash_players', 'peak_24h', 'seven_day_avg']:
-                    # 일반적인 클래스명 패턴들
-                    class_patterns = [
-                        f'{stat_name}', stat_name.replace('_', '-'), 
-                        stat_name.split('_')[0], 'stat', 'number'
-                    ]
-                    
+                cell_classes = [(td, _element_classes(td)) for td in tds]
+                
+                for stat_name, class_patterns in _STAT_CLASS_PATTERNS:
                     for pattern in class_patterns:
-                        td = row.find('td', class_=re.compile(pattern, re.I))
-                        if td:
-                            text = td.get_text(strip=True).replace(',', '')
-                            numbers = re.findall(r'\d+', text)
-                            if numbers:
-                                stats[stat_name] = int(numbers[0])
+                        td = next(
+                            (td for td, classes in cell_classes if any(pattern.search(c) for c in classes)),
+                            None
+                        )
+                        if td is not None:
+                            text = _element_text(td).translate(_COUNT_STRIP)
+                            number = _DIGITS.search(text)
+                            if number:
+                                stats[stat_name] = int(number.group())
                                 break
             
             # 로깅
@@ -555,62 +1018,54 @@ class RobustPokerScoutCrawler:
         
         return stats
     
-    def _is_advertisement_row(self, row) -> bool:
+    def _is_advertisement_row(self, row, tds) -> bool:
         """광고 행이나 특별한 행인지 확인"""
         try:
-            # 광고 관련 키워드 확인
-            text_content = row.get_text(strip=True).lower()
-            
-            # 일반적인 광고 키워드들
-            ad_keywords = [
-                'best bonus', 'bonus', 'advertisement', 'ad', 'promo',
-                'promotion', 'sponsor', 'featured', 'coinpoker'
-            ]
-            
-            for keyword in ad_keywords:
-                if keyword in text_content:
-                    return True
+            # 통계 데이터가 없거나 비정상적인 행 (가장 저렴한 검사부터)
+            if len(tds) < 4:  # 최소 4개 컬럼(순위, 사이트명, 플레이어수, 통계) 필요
+                return True
             
-            # 링크나 광고 class가 있는지 확인
-            if row.find('a', class_=re.compile('ad|bonus|promo', re.I)):
+            # 광고 관련 키워드 확인
+            if _AD_TEXT_RE.search(_element_text(row).lower()):
                 return True
             
+            # 링크 검사는 한 번의 탐색으로 처리
+            links = _LINK_XPATH(row)
+            
             # 비정상적으로 많은 링크가 있는 행 (광고 가능성)
-            links = row.find_all('a')
             if len(links) > 3:
                 return True
             
-            # 통계 데이터가 없거나 비정상적인 행
-            stats_cells = row.find_all('td')
-            if len(stats_cells) < 4:  # 최소 4개 컬럼(순위, 사이트명, 플레이어수, 통계) 필요
-                return True
-                
-            return False
+            # 링크나 광고 class가 있는지 확인
+            return any(
+                _AD_LINK_CLASS.search(link_class)
+                for link in links
+                for link_class in _element_classes(link)
+            )
             
         except Exception as e:
             logger.debug(f"광고 행 검사 중 오류: {e}")
             return False
     
-    def _extract_rank(self, row) -> int:
+    def _extract_rank(self, row, tds) -> int:
         """순위 번호 추출"""
         try:
             # 첫 번째 td에서 순위 찾기
-            first_td = row.find('td')
-            if first_td:
+            if tds:
                 # 숫자만 추출
-                rank_text = first_td.get_text(strip=True)
+                rank_text = _element_text(tds[0])
                 # 순위 번호 패턴 매칭 (1, 2, 3... 또는 #1, #2, #3...)
-                rank_match = re.search(r'#?(\d+)', rank_text)
+                rank_match = _RANK_NUMBER.search(rank_text)
                 if rank_match:
                     return int(rank_match.group(1))
             
             # 대안: class나 id로 순위 셀 찾기
-            rank_cell = row.find('td', class_=re.compile('rank|position', re.I))
-            if rank_cell:
-                rank_text = rank_cell.get_text(strip=True)
-                rank_match = re.search(r'(\d+)', rank_text)
+            rank_cell = _find_by_class(row, 'td', _RANK_CELL_CLASS)
+            if rank_cell is not None:
+                rank_text = _element_text(rank_cell)
+                rank_match = _DIGITS.search(rank_text)
                 if rank_match:
-                    return int(rank_match.group(1))
+                    return int(rank_match.group(0))
             
             return 0  # 순위를 찾을 수 없음
             
@@ -618,58 +1073,45 @@ class RobustPokerScoutCrawler:
             logger.debug(f"순위 추출 중 오류: {e}")
             return 0
     
-    def _extract_site_name(self, row) -> str:
+    def _extract_site_name(self, row, tds) -> str:
         """사이트 이름 추출 (여러 방법 시도)"""
         try:
             # 방법 1: brand-title class
-            brand_title = row.find('span', {'class': 'brand-title'})
+            brand_title = _BRAND_TITLE_XPATH(row)
             if brand_title:
-                site_name = brand_title.get_text(strip=True)
+                site_name = _element_text(brand_title[0])
                 if site_name and len(site_name) > 1:
                     return site_name
             
             # 방법 2: brand 관련 class 검색
-            brand_span = row.find('span', class_=re.compile('brand', re.I))
-            if brand_span:
-                site_name = brand_span.get_text(strip=True)
+            brand_span = _find_by_class(row, 'span', _BRAND_CLASS)
+            if brand_span is not None:
+                site_name = _element_text(brand_span)
                 if site_name and len(site_name) > 1:
                     return site_name
             
             # 방법 3: 사이트 링크에서 추출
-            site_link = row.find('a', class_=re.compile('site|brand', re.I))
-            if site_link:
-                site_name = site_link.get_text(strip=True)
+            site_link = _find_by_class(row, 'a', _SITE_LINK_CLASS)
+            if site_link is not None:
+                site_name = _element_text(site_link)
                 if site_name and len(site_name) > 1:
                     return site_name
             
             # 방법 4: 두 번째 td에서 텍스트 추출 (순위 다음 셀)
-            tds = row.find_all('td')
             if len(tds) >= 2:
                 site_cell = tds[1]  # 두 번째 셀 (첫 번째는 보통 순위)
                 # 링크가 있으면 링크 텍스트 사용
-                link = site_cell.find('a')
-                if link:
-                    site_name = link.get_text(strip=True)
-                else:
-                    site_name = site_cell.get_text(strip=True)
+                link = _LINK_XPATH(site_cell)
+                site_name = _element_text(link[0] if link else site_cell)
                 
                 if site_name and len(site_name) > 1:
                     return site_name
             
             # 방법 5: 강력한 패턴으로 사이트명 검색
-            all_text = row.get_text()
-            # 알려진 포커 사이트 패턴들
-            poker_sites = [
-                r'PokerStars?', r'GGPoker(?:\s+ON)?', r'WPT\s+Global?', 
-                r'partypoker', r'888poker', r'BetMGM', r'Natural8',
-                r'CoinPoker', r'Ignition', r'BetOnline', r'Americas Cardroom',
-                r'Bodog', r'SportsBetting', r'Bovada', r'WSOP'
-            ]
-            
-            for pattern in poker_sites:
-                match = re.search(pattern, all_text, re.IGNORECASE)
-                if match:
-                    return match.group(0).strip()
+            all_text = _element_text(row, strip=False)
+            match = _POKER_SITE_RE.search(all_text)
+            if match:
+                return match.group(0).strip()
             
             return ""
             
@@ -677,58 +1119,43 @@ class RobustPokerScoutCrawler:
             logger.debug(f"사이트명 추출 중 오류: {e}")
             return ""
     
-    def _clean_site_name(self, site_name: str) -> str:
-        """사이트명 정리 및 표준화"""
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _clean_site_name(site_name: str) -> str:
+        """사이트명 정리 및 표준화 (순수 함수이므로 결과 캐시)"""
         if not site_name:
             return ""
         
         # 특수문자 제거 (허용: 문자, 숫자, 공백, 하이픈, 괄호, 점, &)
-        cleaned = re.sub(r'[^\w\s\-\(\)\.&]', '', site_name).strip()
+        cleaned = _SITE_NAME_CLEAN.sub('', site_name).strip()
         
         # 연속 공백 제거
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        
-        # 알려진 사이트명 표준화
-        standardizations = {
-            'gg poker': 'GGPoker',
-            'ggpoker on': 'GGPoker ON',
-            'wpt global': 'WPT Global',
-            'pokerstars': 'PokerStars',
-            'party poker': 'partypoker',
-            '888 poker': '888poker'
-        }
+        cleaned = ' '.join(cleaned.split())
         
+        # 알려진 사이트명 표준화 (정확히 일치하면 바로 반환, 아니면 부분 문자열 검사)
         cleaned_lower = cleaned.lower()
-        for old, new in standardizations.items():
+        direct = _SITE_NAME_STANDARDIZATIONS.get(cleaned_lower)
+        if direct is not None:
+            return direct
+        
+        for old, new in _SITE_NAME_STANDARDIZATIONS.items():
             if old in cleaned_lower:
-                cleaned = new
-                break
+                return new
         
         return cleaned
     
-    def _determine_category(self, site_name: str) -> str:
-        """사이트 카테고리 결정 (더 포괄적인 매칭)"""
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _determine_category(site_name: str) -> str:
+        """사이트 카테고리 결정 (더 포괄적인 매칭, 순수 함수이므로 결과 캐시)"""
         if not site_name:
             return 'UNKNOWN'
         
         site_lower = site_name.lower()
         
-        # GG Network 관련 사이트들 (더 포괄적)
-        gg_patterns = [
-            'gg', 'natural8', 'betkings', 'ggasia', 'ggpoker'
-        ]
-        
-        for pattern in gg_patterns:
-            if pattern in site_lower:
-                return 'GG_POKER'
-        
-        # 다른 주요 네트워크들
-        if any(keyword in site_lower for keyword in ['pokerstars', 'stars']):
-            return 'POKERSTARS'
-        elif any(keyword in site_lower for keyword in ['wpt', 'world poker tour']):
-            return 'WPT'
-        elif any(keyword in site_lower for keyword in ['party', 'bwin']):
-            return 'PARTY_POKER'
+        for category, keywords in _CATEGORY_KEYWORDS:
+            if any(keyword in site_lower for keyword in keywords):
+                return category
         
         return 'COMPETITOR'
     
@@ -765,13 +1192,62 @@ class RobustPokerScoutCrawler:
         }
         
         filename = f"crawl_failure_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        # 임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 깨진 리포트가 남지 않도록 함
+        tmp_path = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp_path, filename)
         
         logger.info(f"실패 리포트 저장: {filename}")
+        self._rotate_failure_reports()
+    
+    def _rotate_failure_reports(self):
+        """최근 FAILURE_REPORT_KEEP개의 실패 리포트만 남기고 삭제 (파일명이 시각 순으로 정렬됨, 0 이하면 보관 개수 제한 없음)"""
+        if FAILURE_REPORT_KEEP <= 0:
+            return
+        
+        reports = sorted(glob.glob('crawl_failure_*.json'))
+        for old_report in reports[:-FAILURE_REPORT_KEEP]:
+            try:
+                os.remove(old_report)
+            except OSError as e:
+                logger.warning(f"오래된 실패 리포트 삭제 실패: {old_report} ({e})")
+
+# 현재 프로세스에서 마지막으로 발급받은 토큰 {key_path, token, exp}
+_access_token_cache = None
+
+def _load_cached_access_token(key_path: str) -> Optional[str]:
+    """같은 키 파일로 발급받은 토큰이 아직 유효하면 반환 (메모리 -> 파일 순서로 확인)"""
+    cached = _access_token_cache
+    if cached is None:
+        try:
+            with open(ACCESS_TOKEN_CACHE_PATH, 'rb') as f:
+                cached = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return None
+    
+    if not isinstance(cached, dict) or cached.get('key_path') != key_path:
+        return None
+    if time.time() >= cached.get('exp', 0) - ACCESS_TOKEN_REFRESH_MARGIN:
+        return None
+    return cached.get('token')
+
+def _save_access_token(key_path: str, token: str, exp: float):
+    """발급받은 토큰을 메모리와 파일에 저장 (소유자만 읽을 수 있는 임시 파일에 쓴 뒤 교체)"""
+    global _access_token_cache
+    _access_token_cache = {'key_path': key_path, 'token': token, 'exp': exp}
+    
+    tmp_path = f"{ACCESS_TOKEN_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(_access_token_cache))
+        os.replace(tmp_path, ACCESS_TOKEN_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f"액세스 토큰 캐시 저장 실패: {e}")
 
 def get_access_token():
-    """Firebase 액세스 토큰 생성"""
+    """Firebase 액세스 토큰 생성 (만료 60초 전까지는 캐시된 토큰 재사용)"""
     try:
         possible_key_paths = [
             os.path.join(os.path.dirname(os.path.abspath(__file__)), 'key', 'firebase-service-account-key.json'),
@@ -788,75 +1264,89 @@ def get_access_token():
         if not key_path:
             logger.warning("Firebase 키 파일을 찾을 수 없습니다.")
             return None
+        
+        cached_token = _load_cached_access_token(key_path)
+        if cached_token:
+            logger.info("캐시된 Firebase 액세스 토큰 사용")
+            return cached_token
             
+        from google.oauth2 import service_account
+        from google.auth.transport.requests import Request
+        
         credentials = service_account.Credentials.from_service_account_file(
             key_path,
             scopes=['https://www.googleapis.com/auth/datastore']
         )
         
         credentials.refresh(Request())
+        if credentials.expiry:
+            # google-auth의 expiry는 시간대 정보가 없는 UTC 시각
+            _save_access_token(key_path, credentials.token, credentials.expiry.replace(tzinfo=timezone.utc).timestamp())
         return credentials.token
         
     except Exception as e:
         logger.error(f"액세스 토큰 생성 실패: {e}")
         return None
 
-def upload_to_realtime_database(data):
+def upload_to_realtime_database(data, session: requests.Session = None):
     """Realtime Database에 데이터 업로드 (GitHub Pages용)"""
     if not data:
         return False
     
+    session = session or _create_http_session()
+    
     try:
-        # 현재 날짜를 키로 사용
-        date_key = datetime.now().strftime("%Y-%m-%d")
+        # 업로드 시각은 한 번만 구하여 날짜 키와 타임스탬프에 함께 사용 (날짜 키는 로컬 날짜)
+        now = datetime.now(timezone.utc)
+        date_key = now.astimezone().strftime("%Y-%m-%d")
         
         # 데이터 구조 생성
         db_data = {
             "date": date_key,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "sites": []
+            "timestamp": now.isoformat(),
+            # 사이트 데이터 변환
+            "sites": [
+                {
+                    "siteName": site.get('site_name', ''),
+                    "category": site.get('category', 'COMPETITOR'),
+                    "rank": site.get('rank', 999),
+                    "cashPlayers": site.get('cash_players', 0),
+                    "playersOnline": site.get('players_online', 0),
+                    "peak24h": site.get('peak_24h', 0),
+                    "sevenDayAvg": site.get('seven_day_avg', 0)
+                }
+                for site in data
+            ]
         }
         
-        # 사이트 데이터 변환
-        for site in data:
-            site_data = {
-                "siteName": site.get('site_name', ''),
-                "category": site.get('category', 'COMPETITOR'),
-                "rank": site.get('rank', 999),
-                "cashPlayers": site.get('cash_players', 0),
-                "playersOnline": site.get('players_online', 0),
-                "peak24h": site.get('peak_24h', 0),
-                "sevenDayAvg": site.get('seven_day_avg', 0)
-            }
-            db_data["sites"].append(site_data)
-        
-        # 전체 통계 추가
-        total_cash = sum(s.get('cash_players', 0) for s in data)
-        total_online = sum(s.get('players_online', 0) for s in data)
-        gg_sites = [s for s in data if s.get('category') == 'GG_POKER']
-        gg_total = sum(s.get('cash_players', 0) for s in gg_sites)
-        
-        db_data["summary"] = {
-            "totalSites": len(data),
-            "totalCashPlayers": total_cash,
-            "totalOnlinePlayers": total_online,
-            "ggNetworkSites": len(gg_sites),
-            "ggNetworkPlayers": gg_total,
-            "ggNetworkShare": round((gg_total / total_cash * 100) if total_cash > 0 else 0, 1)
-        }
+        # 전체 통계 추가 (한 번의 순회로 집계)
+        summary = _traffic_summary(data)
+        total_cash = summary["totalCashPlayers"]
+        summary["ggNetworkShare"] = round((summary["ggNetworkPlayers"] / total_cash * 100) if total_cash > 0 else 0, 1)
+        db_data["summary"] = summary
         
         # Realtime Database에 업로드
         # 1. pokerData/{date} 경로에 저장
+        # 2. latest 경로에도 저장 (최신 데이터 빠른 접근용)
+        # 두 경로는 같은 본문을 덮어쓰는 독립적인 요청이므로 동시에 전송
         url = f"{FIREBASE_REALTIME_DB_URL}/pokerData/{date_key}.json"
-        response = requests.put(url, json=db_data)
+        latest_url = f"{FIREBASE_REALTIME_DB_URL}/latest.json"
+        body = orjson.dumps(db_data)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dated_future = executor.submit(
+                _retry, lambda: session.put(url, data=body, headers=JSON_HEADERS, timeout=UPLOAD_TIMEOUT)
+            )
+            latest_future = executor.submit(
+                _retry, lambda: session.put(latest_url, data=body, headers=JSON_HEADERS, timeout=UPLOAD_TIMEOUT)
+            )
+            response = dated_future.result()
+            latest_response = latest_future.result()
+        
+        if latest_response.status_code != 200:
+            logger.warning(f"Realtime Database latest 업로드 실패: {latest_response.status_code}")
         
         if response.status_code == 200:
             logger.info(f"✅ Realtime Database 업로드 성공: {date_key}")
-            
-            # 2. latest 경로에도 저장 (최신 데이터 빠른 접근용)
-            latest_url = f"{FIREBASE_REALTIME_DB_URL}/latest.json"
-            requests.put(latest_url, json=db_data)
-            
             return True
         else:
             logger.error(f"❌ Realtime Database 업로드 실패: {response.status_code}")
@@ -866,62 +1356,126 @@ def upload_to_realtime_database(data):
         logger.error(f"Realtime Database 업로드 중 오류: {e}")
         return False
 
-def upload_to_firestore_rest(data, access_token=None):
+def _load_known_sites() -> Dict[str, list]:
+    """Firestore sites 문서에 마지막으로 기록한 {사이트명: [카테고리, 순위]} 로드"""
+    try:
+        with open(KNOWN_SITES_PATH, 'rb') as f:
+            known_sites = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return known_sites if isinstance(known_sites, dict) else {}
+
+def _save_known_sites(known_sites: Dict[str, list]):
+    """기록한 사이트 상태 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f"{KNOWN_SITES_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(known_sites))
+        os.replace(tmp_path, KNOWN_SITES_PATH)
+    except OSError as e:
+        logger.warning(f"사이트 상태 저장 실패: {e}")
+
+def _site_state(site_data: Dict) -> list:
+    """sites 문서 내용 중 크롤링마다 바뀔 수 있는 값 (카테고리, 순위)"""
+    return [site_data['category'], site_data.get('rank', 999)]
+
+def _int_value(value) -> Dict[str, str]:
+    """Firestore REST integerValue (64비트 정수는 문자열로 전달)"""
+    return {"integerValue": str(value)}
+
+def _str_value(value: str) -> Dict[str, str]:
+    """Firestore REST stringValue"""
+    return {"stringValue": value}
+
+def _site_doc_fields(site_data: Dict, last_updated_at: str) -> Dict[str, Dict]:
+    """sites/{사이트명} 문서 필드 (순위 정보 포함)"""
+    return {
+        "site_name": _str_value(site_data['site_name']),
+        "category": _str_value(site_data['category']),
+        "rank": _int_value(site_data.get('rank', 999)),
+        "last_updated_at": {"timestampValue": last_updated_at}
+    }
+
+def _traffic_log_fields(site_data: Dict) -> Dict[str, Dict]:
+    """sites/{사이트명}/traffic_logs/{수집 시각} 문서 필드"""
+    return {
+        "rank": _int_value(site_data.get('rank', 0)),
+        "players_online": _int_value(site_data['players_online']),
+        "cash_players": _int_value(site_data['cash_players']),
+        "peak_24h": _int_value(site_data['peak_24h']),
+        "seven_day_avg": _int_value(site_data['seven_day_avg']),
+        "collected_at": {"timestampValue": site_data['collected_at']}
+    }
+
+def _commit_site_chunk(chunk, session: requests.Session, headers: Dict, last_updated_at: str,
+                       known_sites: Dict[str, list]) -> int:
+    """사이트 묶음의 sites 문서와 traffic_logs 문서 쓰기를 commit 요청 하나로 전송 (성공한 사이트 수 반환)"""
+    writes = []
+    
+    for site_data in chunk:
+        site_name = site_data['site_name']
+        collected_at_iso = site_data['collected_at']
+        # 문서 ID에 '/'가 있으면 경로로 해석되어 commit 전체가 거부되므로 치환
+        site_doc_name = FIRESTORE_SITES_PREFIX + site_name.replace('/', '_')
+        
+        # sites 컬렉션 업데이트 (순위 정보 포함) - 새 사이트이거나 카테고리/순위가 바뀐 경우만
+        if known_sites.get(site_name) != _site_state(site_data):
+            writes.append({"update": {"name": site_doc_name, "fields": _site_doc_fields(site_data, last_updated_at)}})
+        
+        # traffic_logs 하위 컬렉션에 추가
+        writes.append({
+            "update": {
+                "name": f"{site_doc_name}/traffic_logs/{collected_at_iso}",
+                "fields": _traffic_log_fields(site_data)
+            }
+        })
+    
+    body = orjson.dumps({"writes": writes})
+    response = _retry(lambda: session.post(FIRESTORE_COMMIT_URL, data=body, headers=headers, timeout=UPLOAD_TIMEOUT))
+    
+    if response.status_code == 200:
+        return len(chunk)
+    # commit은 원자적이므로 실패 시 묶음 전체가 기록되지 않음 - 원인 파악을 위해 오류 메시지 기록
+    try:
+        error_message = orjson.loads(response.content).get('error', {}).get('message', '')
+    except (ValueError, AttributeError):
+        error_message = response.text[:200]
+    logger.warning(f"Firestore 일괄 쓰기 실패 ({len(chunk)}개 사이트): {response.status_code} {error_message}")
+    return 0
+
+def upload_to_firestore_rest(data, access_token=None, session: requests.Session = None):
     """Firestore에 데이터 업로드"""
     if not data:
         logger.warning("업로드할 데이터가 없습니다.")
         return False
     
+    session = session or _create_http_session()
+    
     logger.info(f"Firestore에 {len(data)}개 사이트 데이터 업로드 시작...")
     
     headers = {'Content-Type': 'application/json'}
     if access_token:
         headers['Authorization'] = f'Bearer {access_token}'
     
-    success_count = 0
+    last_updated_at = datetime.now(timezone.utc).isoformat()
+    known_sites = _load_known_sites()
+    chunks = [data[start:start + FIRESTORE_COMMIT_SITES] for start in range(0, len(data), FIRESTORE_COMMIT_SITES)]
     
     try:
-        for site_data in data:
-            site_name = site_data['site_name']
-            collected_at_iso = site_data['collected_at']
-            
-            # sites 컬렉션 업데이트 (순위 정보 포함)
-            site_url = f"{FIRESTORE_BASE_URL}/sites/{site_name}"
-            site_doc = {
-                "fields": {
-                    "site_name": {"stringValue": site_name},
-                    "category": {"stringValue": site_data['category']},
-                    "rank": {"integerValue": str(site_data.get('rank', 999))},  # 순위 추가
-                    "last_updated_at": {"timestampValue": datetime.now(timezone.utc).isoformat()}
-                }
-            }
-            
-            response = requests.patch(site_url, json=site_doc, headers=headers)
-            
-            if response.status_code not in [200, 204]:
-                logger.warning(f"사이트 문서 업데이트 실패 ({site_name}): {response.status_code}")
-                continue
-            
-            # traffic_logs 하위 컬렉션에 추가
-            doc_id = collected_at_iso
-            traffic_url = f"{FIRESTORE_BASE_URL}/sites/{site_name}/traffic_logs/{doc_id}"
-            traffic_doc = {
-                "fields": {
-                    "rank": {"integerValue": str(site_data.get('rank', 0))},
-                    "players_online": {"integerValue": str(site_data['players_online'])},
-                    "cash_players": {"integerValue": str(site_data['cash_players'])},
-                    "peak_24h": {"integerValue": str(site_data['peak_24h'])},
-                    "seven_day_avg": {"integerValue": str(site_data['seven_day_avg'])},
-                    "collected_at": {"timestampValue": collected_at_iso}
-                }
-            }
-            
-            response = requests.patch(traffic_url, json=traffic_doc, headers=headers)
-            
-            if response.status_code in [200, 201]:
-                success_count += 1
-            else:
-                logger.warning(f"트래픽 로그 생성 실패 ({site_name}): {response.status_code}")
+        # 묶음별 commit은 서로 독립적이므로 동시에 전송 (Firestore 부하를 고려해 동시 요청 수 제한)
+        with ThreadPoolExecutor(max_workers=min(FIRESTORE_UPLOAD_WORKERS, len(chunks))) as executor:
+            results = list(executor.map(
+                lambda chunk: _commit_site_chunk(chunk, session, headers, last_updated_at, known_sites),
+                chunks
+            ))
+        success_count = sum(results)
+        
+        # commit에 성공한 사이트만 기록 상태 갱신
+        for chunk, written in zip(chunks, results):
+            if written:
+                for site_data in chunk:
+                    known_sites[site_data['site_name']] = _site_state(site_data)
+        _save_known_sites(known_sites)
         
         logger.info(f"✅ Firestore 업로드 완료: {success_count}/{len(data)}개 성공")
         return success_count > 0
@@ -930,6 +1484,25 @@ def upload_to_firestore_rest(data, access_token=None):
         logger.error(f"Firestore 업로드 중 오류: {e}")
         return False
 
+def _traffic_summary(data) -> Dict[str, int]:
+    """사이트 목록의 전체 통계를 한 번의 순회로 집계"""
+    total_cash = total_online = gg_total = gg_count = 0
+    for site in data:
+        cash_players = site.get('cash_players', 0)
+        total_cash += cash_players
+        total_online += site.get('players_online', 0)
+        if site.get('category') == 'GG_POKER':
+            gg_total += cash_players
+            gg_count += 1
+    
+    return {
+        "totalSites": len(data),
+        "totalCashPlayers": total_cash,
+        "totalOnlinePlayers": total_online,
+        "ggNetworkSites": gg_count,
+        "ggNetworkPlayers": gg_total
+    }
+
 def save_data_to_public_json(data):
     """GitHub Pages에서 직접 접근 가능한 JSON 파일로 저장"""
     try:
@@ -939,24 +1512,19 @@ def save_data_to_public_json(data):
         data_dir = os.path.join(base_dir, "frontend", "public", "data")
         os.makedirs(data_dir, exist_ok=True)
         
-        # 데이터 구조 생성
+        # 데이터 구조 생성 (저장 시각은 한 번만 구하여 타임스탬프와 로컬 날짜에 함께 사용)
+        now = datetime.now(timezone.utc)
         json_data = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "date": datetime.now().strftime("%Y-%m-%d"),
+            "timestamp": now.isoformat(),
+            "date": now.astimezone().strftime("%Y-%m-%d"),
             "sites": data,
-            "summary": {
-                "totalSites": len(data),
-                "totalCashPlayers": sum(s.get('cash_players', 0) for s in data),
-                "totalOnlinePlayers": sum(s.get('players_online', 0) for s in data),
-                "ggNetworkSites": len([s for s in data if s.get('category') == 'GG_POKER']),
-                "ggNetworkPlayers": sum(s.get('cash_players', 0) for s in data if s.get('category') == 'GG_POKER')
-            }
+            "summary": _traffic_summary(data)
         }
         
         # JSON 파일로 저장
         file_path = os.path.join(data_dir, "latest.json")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
         
         logger.info(f"✅ JSON 파일 저장 성공: {file_path}")
         return True
@@ -993,16 +1561,31 @@ def run_enhanced_crawl():
                     f"{site['players_online']:,}명 온라인"
                 )
             
+            # 캐시 데이터는 이전 실행(최대 24시간 전)에 이미 저장된 스냅샷이므로
+            # 오늘 날짜/현재 시각으로 다시 저장하지 않음
+            if method == CACHED_DATA_METHOD:
+                logger.warning(
+                    f"캐시 데이터({crawler.last_successful_time:%Y-%m-%d %H:%M:%S} 수집)는 "
+                    f"새 스냅샷이 아니므로 JSON/Firebase 저장을 건너뜁니다"
+                )
+                return True
+            
             # 데이터 저장 (여러 방식 시도)
             # 1. JSON 파일로 저장 (GitHub Pages용)
             json_success = save_data_to_public_json(crawled_data)
             
-            # 2. Realtime Database 업로드 (백업용)
-            realtime_success = upload_to_realtime_database(crawled_data)
+            # Firebase 업로드는 하나의 세션으로 커넥션 재사용
+            upload_session = _create_http_session()
             
-            # 3. Firestore 업로드 (기존 방식)
-            access_token = get_access_token()
-            upload_success = upload_to_firestore_rest(crawled_data, access_token)
+            # 2. Realtime Database 업로드 (백업용)와
+            # 3. Firestore 업로드 (기존 방식, 토큰 발급 포함)는 서로 독립적이므로 동시에 진행
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix='upload') as executor:
+                realtime_future = executor.submit(upload_to_realtime_database, crawled_data, upload_session)
+                firestore_future = executor.submit(
+                    lambda: upload_to_firestore_rest(crawled_data, get_access_token(), upload_session)
+                )
+                realtime_success = realtime_future.result()
+                upload_success = firestore_future.result()
             
             if not upload_success:
                 # 업로드 실패 알림
@@ -1015,8 +1598,12 @@ def run_enhanced_crawl():
                 
                 # 백업 저장
                 backup_file = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                with open(backup_file, 'w', encoding='utf-8') as f:
-                    json.dump(crawled_data, f, ensure_ascii=False, indent=2)
+                # 기본은 간결한 형식, POKER_BACKUP_INDENT가 설정되면 사람이 읽기 쉽게 들여쓰기
+                backup_option = orjson.OPT_APPEND_NEWLINE
+                if os.environ.get('POKER_BACKUP_INDENT'):
+                    backup_option |= orjson.OPT_INDENT_2
+                with open(backup_file, 'wb') as f:
+                    f.write(orjson.dumps(crawled_data, option=backup_option))
                 logger.info(f"백업 파일 저장: {backup_file}")
             
             return True
@@ -36,7 +36,7 @@ def run_github_actions_crawl():
         
         # Crawl data
         logger.info("Starting crawl...")
-        crawled_data = crawler.crawl_pokerscout_data()
+        crawled_data = crawler.crawl_pokerscout_data(force_refresh=True)
         
         if crawled_data:
             logger.info(f"Crawl success: {len(crawled_data)} sites found")
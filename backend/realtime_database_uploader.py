@@ -3,11 +3,28 @@
 Firebase Realtime Database 업로더
 GitHub Pages와 호환되도록 데이터를 Realtime Database에 업로드
 """
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 import logging
 
+# 같은 호스트로 보내는 요청이 TCP/TLS 연결을 재사용하도록 모듈 전역 세션 사용
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    # 재시도 후에도 실패하면 예외 대신 마지막 응답을 반환하여 기존 상태 코드 처리 유지
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+)
+SESSION.mount("https://", _adapter)
+# (연결 타임아웃, 읽기 타임아웃) 초
+REQUEST_TIMEOUT = (5, 30)
+# orjson으로 직렬화한 bytes 본문을 보낼 때 사용하는 헤더
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -21,56 +38,67 @@ def upload_to_realtime_database(data):
         return False
     
     try:
-        # 현재 날짜를 키로 사용
-        date_key = datetime.now().strftime("%Y-%m-%d")
+        # 업로드 시각은 한 번만 구하여 날짜 키와 타임스탬프에 함께 사용 (날짜 키는 로컬 날짜)
+        now = datetime.now(timezone.utc)
+        date_key = now.astimezone().strftime("%Y-%m-%d")
         
         # 데이터 구조 생성
         db_data = {
             "date": date_key,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "sites": []
+            "timestamp": now.isoformat(),
+            # 사이트 데이터 변환
+            "sites": [
+                {
+                    "siteName": site.get('site_name', ''),
+                    "category": site.get('category', 'COMPETITOR'),
+                    "rank": site.get('rank', 999),
+                    "cashPlayers": site.get('cash_players', 0),
+                    "playersOnline": site.get('players_online', 0),
+                    "peak24h": site.get('peak_24h', 0),
+                    "sevenDayAvg": site.get('seven_day_avg', 0)
+                }
+                for site in data
+            ]
         }
         
-        # 사이트 데이터 변환
+        # 전체 통계 추가 (한 번의 순회로 집계)
+        total_cash = total_online = gg_total = gg_count = 0
         for site in data:
-            site_data = {
-                "siteName": site.get('site_name', ''),
-                "category": site.get('category', 'COMPETITOR'),
-                "rank": site.get('rank', 999),
-                "cashPlayers": site.get('cash_players', 0),
-                "playersOnline": site.get('players_online', 0),
-                "peak24h": site.get('peak_24h', 0),
-                "sevenDayAvg": site.get('seven_day_avg', 0)
-            }
-            db_data["sites"].append(site_data)
-        
-        # 전체 통계 추가
-        total_cash = sum(s.get('cash_players', 0) for s in data)
-        total_online = sum(s.get('players_online', 0) for s in data)
-        gg_sites = [s for s in data if s.get('category') == 'GG_POKER']
-        gg_total = sum(s.get('cash_players', 0) for s in gg_sites)
+            cash_players = site.get('cash_players', 0)
+            total_cash += cash_players
+            total_online += site.get('players_online', 0)
+            if site.get('category') == 'GG_POKER':
+                gg_total += cash_players
+                gg_count += 1
         
         db_data["summary"] = {
             "totalSites": len(data),
             "totalCashPlayers": total_cash,
             "totalOnlinePlayers": total_online,
-            "ggNetworkSites": len(gg_sites),
+            "ggNetworkSites": gg_count,
             "ggNetworkPlayers": gg_total,
             "ggNetworkShare": round((gg_total / total_cash * 100) if total_cash > 0 else 0, 1)
         }
         
         # Realtime Database에 업로드
         # 1. pokerData/{date} 경로에 저장
+        # 2. latest 경로에도 저장 (최신 데이터 빠른 접근용)
+        # 두 경로는 같은 본문을 덮어쓰는 독립적인 요청이므로 동시에 전송
         url = f"{FIREBASE_DB_URL}/pokerData/{date_key}.json"
-        response = requests.put(url, json=db_data)
+        latest_url = f"{FIREBASE_DB_URL}/latest.json"
+        body = orjson.dumps(db_data)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dated_future = executor.submit(SESSION.put, url, data=body, headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
+            latest_future = executor.submit(SESSION.put, latest_url, data=body, headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
+            response = dated_future.result()
+            latest_response = latest_future.result()
+        
+        # latest 실패는 기록만 하고 결과는 날짜 경로 업로드 기준으로 판단
+        if latest_response.status_code != 200:
+            logger.warning(f"Realtime Database latest 업로드 실패: {latest_response.status_code}")
         
         if response.status_code == 200:
             logger.info(f"✅ Realtime Database 업로드 성공: {date_key}")
-            
-            # 2. latest 경로에도 저장 (최신 데이터 빠른 접근용)
-            latest_url = f"{FIREBASE_DB_URL}/latest.json"
-            requests.put(latest_url, json=db_data)
-            
             return True
         else:
             logger.error(f"❌ Realtime Database 업로드 실패: {response.status_code}")
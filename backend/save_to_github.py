@@ -3,10 +3,61 @@
 GitHub에 데이터를 JSON 파일로 저장하는 스크립트
 Firebase 대신 GitHub를 데이터 저장소로 사용
 """
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timezone
+import base64
+import hashlib
 import os
+import tempfile
+
+# 같은 호스트로 보내는 요청이 TCP/TLS 연결을 재사용하도록 모듈 전역 세션 사용
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    # 재시도 후에도 실패하면 예외 대신 마지막 응답을 반환하여 기존 상태 코드 처리 유지
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+)
+SESSION.mount("https://", _adapter)
+# (연결 타임아웃, 읽기 타임아웃) 초
+REQUEST_TIMEOUT = (5, 30)
+# 마지막으로 업로드한 latest.json의 blob SHA (다음 업로드에서 SHA 조회 GET 생략)
+SHA_CACHE_PATH = os.environ.get(
+    'GITHUB_LATEST_SHA_CACHE_PATH',
+    os.path.join(tempfile.gettempdir(), 'poker_latest_json.sha')
+)
+
+def _git_blob_sha(content):
+    """GitHub contents API가 파일 SHA로 사용하는 git blob SHA-1 계산"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+def _load_cached_sha():
+    """캐시된 파일 SHA 로드 (없으면 None)"""
+    try:
+        with open(SHA_CACHE_PATH, 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def _save_cached_sha(sha):
+    """업로드한 파일 SHA 저장 (임시 파일에 쓴 뒤 교체)"""
+    tmp_path = f"{SHA_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            f.write(sha)
+        os.replace(tmp_path, SHA_CACHE_PATH)
+    except OSError as e:
+        print(f"⚠️ SHA 캐시 저장 실패: {e}")
+
+def _fetch_remote_sha(api_url, headers):
+    """저장소에 있는 파일의 SHA 조회 (파일이 없으면 None)"""
+    response = SESSION.get(api_url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 200:
+        return response.json()["sha"]
+    return None
 
 def save_data_to_github(data, github_token=None):
     """GitHub 저장소에 데이터를 JSON 파일로 저장"""
@@ -19,22 +70,34 @@ def save_data_to_github(data, github_token=None):
     # 파일 경로 설정 (public 폴더에 저장하여 GitHub Pages에서 접근 가능)
     file_path = "frontend/public/data/latest.json"
     
-    # 데이터 준비
+    # 전체 통계는 한 번의 순회로 집계
+    total_cash = total_online = gg_total = gg_count = 0
+    for site in data:
+        cash_players = site.get('cash_players', 0)
+        total_cash += cash_players
+        total_online += site.get('players_online', 0)
+        if site.get('category') == 'GG_POKER':
+            gg_total += cash_players
+            gg_count += 1
+    
+    # 데이터 준비 (저장 시각은 한 번만 구하여 타임스탬프, 로컬 날짜, 커밋 메시지에 함께 사용)
+    now = datetime.now(timezone.utc)
+    local_now = now.astimezone()
     json_data = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "date": datetime.now().strftime("%Y-%m-%d"),
+        "timestamp": now.isoformat(),
+        "date": local_now.strftime("%Y-%m-%d"),
         "sites": data,
         "summary": {
             "totalSites": len(data),
-            "totalCashPlayers": sum(s.get('cash_players', 0) for s in data),
-            "totalOnlinePlayers": sum(s.get('players_online', 0) for s in data),
-            "ggNetworkSites": len([s for s in data if s.get('category') == 'GG_POKER']),
-            "ggNetworkPlayers": sum(s.get('cash_players', 0) for s in data if s.get('category') == 'GG_POKER')
+            "totalCashPlayers": total_cash,
+            "totalOnlinePlayers": total_online,
+            "ggNetworkSites": gg_count,
+            "ggNetworkPlayers": gg_total
         }
     }
     
-    # JSON 파일 내용
-    content = json.dumps(json_data, ensure_ascii=False, indent=2)
+    # JSON 파일 내용 (UTF-8 bytes, 한글 등은 이스케이프하지 않음)
+    content = orjson.dumps(json_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
     
     if github_token:
         # GitHub API를 통해 업로드
@@ -42,29 +105,32 @@ def save_data_to_github(data, github_token=None):
         
         headers = {
             "Authorization": f"token {github_token}",
-            "Accept": "application/vnd.github.v3+json"
+            "Accept": "application/vnd.github.v3+json",
+            "Content-Type": "application/json"
         }
         
-        # 기존 파일 SHA 가져오기
-        response = requests.get(api_url, headers=headers)
-        sha = None
-        if response.status_code == 200:
-            sha = response.json()["sha"]
-        
         # 파일 업데이트
-        import base64
         data = {
-            "message": f"Update poker data - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            "content": base64.b64encode(content.encode()).decode(),
+            "message": f"Update poker data - {local_now.strftime('%Y-%m-%d %H:%M')}",
+            "content": base64.b64encode(content).decode(),
             "branch": branch
         }
         
-        if sha:
-            data["sha"] = sha
+        def put_file(sha):
+            body = {**data, "sha": sha} if sha else data
+            return SESSION.put(api_url, data=orjson.dumps(body), headers=headers, timeout=REQUEST_TIMEOUT)
+        
+        # 기존 파일 SHA는 마지막 업로드 때 저장한 값을 먼저 사용하고, 없을 때만 조회
+        cached_sha = _load_cached_sha()
+        response = put_file(cached_sha or _fetch_remote_sha(api_url, headers))
         
-        response = requests.put(api_url, json=data, headers=headers)
+        # 다른 곳에서 파일이 바뀌어 캐시된 SHA가 맞지 않으면 (409/422) 최신 SHA를 조회하여 한 번 더 시도
+        if cached_sha and response.status_code in (409, 422):
+            response = put_file(_fetch_remote_sha(api_url, headers))
         
         if response.status_code in [200, 201]:
+            # 업로드한 내용의 blob SHA가 곧 다음 업로드에 필요한 SHA
+            _save_cached_sha(_git_blob_sha(content))
             print(f"✅ Successfully saved to GitHub: {file_path}")
             return True
         else:
@@ -74,7 +140,7 @@ def save_data_to_github(data, github_token=None):
     else:
         # 로컬 파일로 저장
         os.makedirs("frontend/public/data", exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
+        with open(file_path, 'wb') as f:
             f.write(content)
         print(f"✅ Saved locally: {file_path}")
         return True
@@ -7,14 +7,23 @@
 """
 import sys
 import os
+import atexit
+import signal
 import logging
 from datetime import datetime, timezone
 import json
+import gzip
 import re
 import time
 import random
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait as wait_futures
 from typing import List, Dict, Optional
 import requests
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from google.oauth2 import service_account
 from google.auth.transport.requests import Request
@@ -41,7 +50,76 @@ logger = logging.getLogger(__name__)
 
 # Firebase 프로젝트 설정
 FIREBASE_PROJECT_ID = "poker-online-analyze"
-FIRESTORE_BASE_URL = f"https://firestore.googleapis.com/v1/projects/{FIREBASE_PROJECT_ID}/databases/(default)/documents"
+FIRESTORE_DOCUMENTS_PATH = f"projects/{FIREBASE_PROJECT_ID}/databases/(default)/documents"
+FIRESTORE_BASE_URL = f"https://firestore.googleapis.com/v1/{FIRESTORE_DOCUMENTS_PATH}"
+FIRESTORE_COMMIT_URL = f"{FIRESTORE_BASE_URL}:commit"
+# commit 요청 하나에 담을 수 있는 최대 쓰기 수 (Firestore 제한 500 / 사이트당 쓰기 2개)
+FIRESTORE_COMMIT_SITES = 250
+# 동시에 보내는 commit 요청 수 상한
+FIRESTORE_UPLOAD_WORKERS = 8
+# Firebase 액세스 토큰 캐시 파일 (만료 전까지 실행 간 재사용)
+ACCESS_TOKEN_CACHE_PATH = os.environ.get(
+    'FIREBASE_TOKEN_CACHE_PATH',
+    os.path.join(tempfile.gettempdir(), 'firebase_access_token.json')
+)
+# 만료 시각보다 이만큼 먼저 토큰을 갱신 (초)
+ACCESS_TOKEN_REFRESH_MARGIN = 60
+
+# Firestore / ProxyScrape 요청이 TCP/TLS 연결을 재사용하도록 모듈 전역 세션 사용
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    # commit은 문서 전체를 덮어쓰는 update 쓰기만 담으므로 POST도 재시도 대상에 포함
+    # 재시도 후에도 실패하면 예외 대신 마지막 응답을 반환하여 기존 상태 코드 처리 유지
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'POST'},
+        raise_on_status=False
+    )
+))
+
+POKERSCOUT_URL = 'https://www.pokerscout.com'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+# 브라우저 없이 먼저 시도하는 일반 HTTP 요청 (연결, 읽기 타임아웃 초)
+DIRECT_FETCH_TIMEOUT = (5, 10)
+
+# 크롤링에 필요 없는 리소스 (스타일, 폰트, 이미지, 광고/분석 스크립트) - CDP로 요청 자체를 차단
+# rankTable은 HTML에 포함되어 있고 봇 검사 스크립트가 필요할 수 있으므로 일반 JS는 차단하지 않음
+BLOCKED_URL_PATTERNS = [
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico',
+    '*google-analytics*', '*googletagmanager*', '*doubleclick*', '*googlesyndication*',
+]
+
+# 랭킹 테이블이 렌더링되었는지 판단하는 요소 (데이터 행의 사이트명)
+RANK_ROW_LOCATOR = (By.CSS_SELECTOR, 'table.rankTable tr .brand-title')
+
+# 사이트명 정리용 정규식 (허용: 문자, 숫자, 공백, 하이픈, 괄호, 점, &)
+_SITE_NAME_RE = re.compile(r'[^\w\s\-\(\)\.&]')
+# 숫자 셀에서 제거할 문자 (천 단위 구분자, 공백)
+_COUNT_STRIP = str.maketrans('', '', ', \t\r\n\xa0')
+# (데이터 키, td id, span 안의 텍스트 사용 여부) - cash 셀은 td 텍스트를 그대로 사용
+_TD_FIELDS = (
+    ('players_online', 'online', True),
+    ('cash_players', 'cash', False),
+    ('peak_24h', 'peak', True),
+    ('seven_day_avg', 'avg', True),
+)
+
+# ProxyScrape 응답 캐시 파일과 유효 시간 (초) - 짧은 시간 안에 여러 번 실행해도 API는 한 번만 호출
+PROXY_CACHE_PATH = os.environ.get(
+    'PROXY_CACHE_PATH',
+    os.path.join(tempfile.gettempdir(), 'proxyscrape_cache.json')
+)
+PROXY_CACHE_TTL = 300
+
+# 브라우저 없이 먼저 시도하는 PokerScout 요청 전용 세션 - Cloudflare 429/503 응답을 바로 받아
+# Selenium으로 넘어가야 하므로 재시도(Retry-After 대기 포함)를 하지 않음
+_PROBE_SESSION = requests.Session()
+_PROBE_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0))
 
 # 무료 프록시 리스트 (선택적)
 FREE_PROXY_LIST = [
@@ -50,17 +128,96 @@ FREE_PROXY_LIST = [
     # "http://proxy2.com:8080",
 ]
 
+# 아직 종료되지 않은 드라이버 (비정상 종료 시에도 브라우저 프로세스가 남지 않도록 추적)
+_active_drivers = set()
+_active_drivers_lock = threading.Lock()
+# undetected-chromedriver는 데이터 디렉터리의 드라이버 바이너리 하나를 내려받아 패치하므로
+# 여러 스레드에서 동시에 생성하면 같은 파일을 두고 경쟁함 - 생성만 직렬화하고 크롤링은 병렬로 진행
+_driver_create_lock = threading.Lock()
+
+def _quit_driver(driver):
+    """드라이버 종료 - quit 후에도 살아 있는 chromedriver/Chrome 프로세스는 강제 종료 (이미 종료한 드라이버는 무시)"""
+    with _active_drivers_lock:
+        if driver not in _active_drivers:
+            return
+        _active_drivers.discard(driver)
+    
+    service_process = getattr(getattr(driver, 'service', None), 'process', None)
+    browser_pid = getattr(driver, 'browser_pid', None)
+    try:
+        driver.quit()
+        quit_failed = False
+    except Exception as e:
+        logger.warning(f"드라이버 종료 실패 - 프로세스 강제 종료: {e}")
+        quit_failed = True
+    
+    # Popen 객체는 종료 여부를 직접 알 수 있으므로 살아 있을 때만 종료
+    if service_process is not None and service_process.poll() is None:
+        try:
+            service_process.kill()
+        except OSError:
+            pass
+    # 브라우저는 PID만 알 수 있으므로 quit이 실패한 경우에만 종료 (재사용된 PID 오인 방지)
+    if quit_failed and browser_pid:
+        try:
+            os.kill(browser_pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+        except OSError:
+            pass
+
+@atexit.register
+def _quit_all_drivers():
+    """인터프리터 종료 시 남아 있는 드라이버 정리"""
+    with _active_drivers_lock:
+        drivers = list(_active_drivers)
+    for driver in drivers:
+        _quit_driver(driver)
+
+def _to_int(text: str) -> int:
+    """'1,234' 형태의 셀 텍스트를 정수로 변환 (숫자가 아니거나 음수면 0)"""
+    try:
+        return max(int(text.translate(_COUNT_STRIP)), 0)
+    except ValueError:
+        return 0
+
 class ProxyManager:
     """프록시 로테이션 관리자"""
     def __init__(self):
         self.proxies = self._fetch_free_proxies()
         self.current_proxy_index = 0
+        # 동시 크롤링 시도에서 프록시 목록을 함께 사용하므로 잠금으로 보호
+        self._lock = threading.Lock()
         
+    def _load_cached_proxies(self) -> Optional[List[str]]:
+        """캐시 파일이 유효 시간 안에 저장되었으면 프록시 목록 반환"""
+        try:
+            if time.time() - os.path.getmtime(PROXY_CACHE_PATH) >= PROXY_CACHE_TTL:
+                return None
+            with open(PROXY_CACHE_PATH, 'r', encoding='utf-8') as f:
+                proxies = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return proxies if isinstance(proxies, list) and proxies else None
+    
+    def _save_cached_proxies(self, proxies: List[str]):
+        """프록시 목록을 캐시 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = f"{PROXY_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(proxies, f)
+            os.replace(tmp_path, PROXY_CACHE_PATH)
+        except OSError as e:
+            logger.warning(f"프록시 목록 캐시 저장 실패: {e}")
+    
     def _fetch_free_proxies(self) -> List[str]:
-        """무료 프록시 리스트 가져오기 (API 또는 하드코딩)"""
+        """무료 프록시 리스트 가져오기 (캐시, API 또는 하드코딩)"""
+        cached_proxies = self._load_cached_proxies()
+        if cached_proxies:
+            logger.info(f"캐시된 프록시 목록 사용: {len(cached_proxies)}개")
+            return cached_proxies
+        
         try:
             # ProxyScrape API 사용 예시 (무료)
-            response = requests.get(
+            response = _HTTP_SESSION.get(
                 'https://api.proxyscrape.com/v2/',
                 params={
                     'request': 'get',
@@ -76,7 +233,10 @@ class ProxyManager:
             if response.status_code == 200:
                 proxy_list = response.text.strip().split('\n')
                 # HTTP 형식으로 변환
-                return [f"http://{proxy}" for proxy in proxy_list[:10] if proxy]
+                proxies = [f"http://{proxy.strip()}" for proxy in proxy_list[:10] if proxy.strip()]
+                if proxies:
+                    self._save_cached_proxies(proxies)
+                return proxies
         except Exception as e:
             logger.warning(f"프록시 목록 가져오기 실패: {e}")
         
@@ -85,25 +245,36 @@ class ProxyManager:
     
     def get_next_proxy(self) -> Optional[str]:
         """다음 프록시 반환"""
-        if not self.proxies:
-            return None
-        proxy = self.proxies[self.current_proxy_index % len(self.proxies)]
-        self.current_proxy_index += 1
-        return proxy
+        with self._lock:
+            if not self.proxies:
+                return None
+            proxy = self.proxies[self.current_proxy_index % len(self.proxies)]
+            self.current_proxy_index += 1
+            return proxy
     
     def mark_proxy_as_bad(self, proxy: str):
         """실패한 프록시 제거"""
-        if proxy in self.proxies:
-            self.proxies.remove(proxy)
-            logger.info(f"프록시 제거됨: {proxy}, 남은 프록시: {len(self.proxies)}개")
+        with self._lock:
+            if proxy in self.proxies:
+                self.proxies.remove(proxy)
+                logger.info(f"프록시 제거됨: {proxy}, 남은 프록시: {len(self.proxies)}개")
 
 class EnhancedPokerScoutCrawler:
-    def __init__(self, use_proxy: bool = True, headless: bool = True):
+    def __init__(self, use_proxy: bool = True, headless: bool = True,
+                 chrome_args: Optional[List[str]] = None, chrome_prefs: Optional[Dict] = None,
+                 remote_url: Optional[str] = None):
         self.use_proxy = use_proxy
         self.headless = headless
+        # Selenium Grid / standalone-chrome 주소 (지정하면 로컬 Chrome 대신 원격 세션 사용)
+        self.remote_url = remote_url
+        # 기본 옵션에 추가할 Chrome 실행 인자와 환경설정 (테스트 등에서 속도 옵션을 지정할 때 사용)
+        self.chrome_args = list(chrome_args or [])
+        self.chrome_prefs = dict(chrome_prefs or {})
         self.proxy_manager = ProxyManager() if use_proxy else None
-        self.gg_poker_sites = ['GGNetwork', 'GGPoker ON', 'GG Poker', 'GGPoker']
+        self.gg_poker_sites = frozenset(['GGNetwork', 'GGPoker ON', 'GG Poker', 'GGPoker'])
+        # 재시도 사이에 재사용하는 브라우저 (프록시가 바뀌거나 세션이 끊긴 경우에만 새로 생성)
         self.driver = None
+        self._driver_proxy = None
         self.max_retries = 3
         
     def _create_driver(self, proxy: Optional[str] = None) -> uc.Chrome:
@@ -120,16 +291,21 @@ class EnhancedPokerScoutCrawler:
         options.add_argument('--disable-blink-features=AutomationControlled')
         options.add_argument('--disable-web-security')
         options.add_argument('--disable-features=IsolateOrigins,site-per-process')
-        options.add_argument(f'--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        options.add_argument(f'--user-agent={USER_AGENT}')
         
         # 프록시 설정
         if proxy:
             options.add_argument(f'--proxy-server={proxy}')
             logger.info(f"프록시 사용: {proxy}")
         
+        for arg in self.chrome_args:
+            options.add_argument(arg)
+        
         # 이미지 로딩 비활성화 (속도 향상)
-        prefs = {"profile.managed_default_content_settings.images": 2}
+        prefs = {"profile.managed_default_content_settings.images": 2, **self.chrome_prefs}
         options.add_experimental_option("prefs", prefs)
+        # DOMContentLoaded 시점에 driver.get 반환 (이후 필요한 요소는 WebDriverWait로 대기)
+        options.page_load_strategy = 'eager'
         
         # GitHub Actions 환경 감지
         if os.environ.get('GITHUB_ACTIONS'):
@@ -137,28 +313,94 @@ class EnhancedPokerScoutCrawler:
             options.add_argument('--window-size=1920,1080')
         
         try:
-            driver = uc.Chrome(options=options, version_main=None)
+            if self.remote_url:
+                # 원격 노드의 Chrome 사용 (undetected-chromedriver 패치는 적용되지 않음)
+                driver = webdriver.Remote(command_executor=self.remote_url, options=options)
+            else:
+                with _driver_create_lock:
+                    driver = uc.Chrome(options=options, version_main=None)
+            with _active_drivers_lock:
+                _active_drivers.add(driver)
             # 페이지 로드 타임아웃 설정
             driver.set_page_load_timeout(30)
+            self._block_unneeded_resources(driver)
             return driver
         except Exception as e:
             logger.error(f"드라이버 생성 실패: {e}")
             raise
     
+    def _block_unneeded_resources(self, driver: uc.Chrome):
+        """CDP로 스타일/폰트/이미지/광고 요청 차단 (실패해도 크롤링은 계속)"""
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            logger.warning(f"리소스 차단 설정 실패: {e}")
+    
+    def _driver_alive(self) -> bool:
+        """현재 드라이버 세션이 살아 있는지 확인"""
+        if self.driver is None or not self.driver.session_id:
+            return False
+        try:
+            self.driver.current_url  # 가벼운 명령으로 세션 확인
+            return True
+        except WebDriverException:
+            return False
+    
+    def _ensure_driver(self, proxy: Optional[str] = None) -> uc.Chrome:
+        """
+        재사용 가능한 드라이버 반환
+        - 같은 프록시로 살아 있는 세션이면 쿠키와 페이지만 초기화하여 재사용
+        - 프록시는 브라우저 실행 옵션이므로 바뀌면 새로 생성
+        """
+        if proxy == self._driver_proxy and self._driver_alive():
+            try:
+                self.driver.delete_all_cookies()
+                self.driver.get('about:blank')
+                return self.driver
+            except WebDriverException as e:
+                logger.warning(f"드라이버 초기화 실패, 새로 생성: {e}")
+        
+        self.close()
+        self.driver = self._create_driver(proxy)
+        self._driver_proxy = proxy
+        return self.driver
+    
+    def close(self):
+        """드라이버 종료 (크롤링이 모두 끝난 뒤 한 번 호출)"""
+        if self.driver:
+            _quit_driver(self.driver)
+        self.driver = None
+        self._driver_proxy = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
     def _random_delay(self, min_sec: float = 0.5, max_sec: float = 2.0):
         """무작위 지연 (인간처럼 보이기)"""
         time.sleep(random.uniform(min_sec, max_sec))
     
     def _scroll_page(self, driver):
-        """페이지 스크롤 (동적 콘텐츠 로딩)"""
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight * 0.3);")
-        self._random_delay(0.3, 0.7)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight * 0.6);")
-        self._random_delay(0.3, 0.7)
+        """페이지 스크롤 (동적 콘텐츠 로딩) - 로딩 완료는 호출한 쪽에서 DOM 조건으로 대기"""
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         
     def crawl_with_retry(self) -> List[Dict]:
         """재시도 로직이 포함된 크롤링"""
+        # 랭킹 테이블은 서버에서 렌더링되므로 차단되지 않았다면 브라우저 없이 바로 가져옴
+        # (프록시 모드에서는 실제 IP로 요청하지 않도록 건너뜀)
+        if not self.use_proxy:
+            result = self._crawl_direct()
+            if result:
+                return result
+        
+        # 프록시가 여러 개면 순서대로 기다리지 않고 동시에 시도하여 가장 먼저 성공한 결과 사용
+        if self.proxy_manager and len(self.proxy_manager.proxies) > 1:
+            return self._crawl_concurrently()
+        
         for attempt in range(self.max_retries):
             proxy = None
             if self.use_proxy and self.proxy_manager:
@@ -177,100 +419,97 @@ class EnhancedPokerScoutCrawler:
         logger.error("모든 재시도 실패")
         return []
     
+    def _crawl_concurrently(self) -> List[Dict]:
+        """프록시마다 별도 브라우저로 동시에 크롤링하고 처음 성공한 결과 반환"""
+        proxies = []
+        for _ in range(self.max_retries):
+            proxy = self.proxy_manager.get_next_proxy()
+            if proxy and proxy not in proxies:
+                proxies.append(proxy)
+        if not proxies:
+            logger.error("사용 가능한 프록시 없음")
+            return []
+        
+        logger.info(f"{len(proxies)}개 프록시로 동시 크롤링 시도")
+        drivers = []
+        drivers_lock = threading.Lock()
+        # 첫 성공 결과가 나오면 설정 - 이후 브라우저 생성을 마친 시도는 크롤링 없이 바로 종료
+        stop_event = threading.Event()
+        
+        def attempt(proxy):
+            if stop_event.is_set():
+                return []
+            driver = self._create_driver(proxy)
+            with drivers_lock:
+                if stop_event.is_set():
+                    _quit_driver(driver)
+                    return []
+                drivers.append(driver)
+            try:
+                return self._crawl_page(driver)
+            finally:
+                _quit_driver(driver)
+        
+        executor = ThreadPoolExecutor(max_workers=len(proxies))
+        futures = {executor.submit(attempt, proxy): proxy for proxy in proxies}
+        pending = set(futures)
+        result = []
+        try:
+            while pending and not result:
+                done, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    proxy = futures[future]
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        logger.error(f"크롤링 실패 (프록시 {proxy}): {e}")
+                        data = []
+                    if not data:
+                        self.proxy_manager.mark_proxy_as_bad(proxy)
+                    elif not result:
+                        result = data
+        finally:
+            # 아직 진행 중인 시도는 브라우저를 닫아 바로 끝나도록 하고, 생성 중인 시도는 생성 직후 종료되도록 표시
+            with drivers_lock:
+                stop_event.set()
+                running_drivers = list(drivers)
+            for driver in running_drivers:
+                _quit_driver(driver)
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if not result:
+            logger.error("모든 재시도 실패")
+        return result
+    
+    def _crawl_direct(self) -> List[Dict]:
+        """Chrome 없이 일반 HTTP 요청으로 크롤링 (차단되거나 테이블이 없으면 빈 리스트)"""
+        try:
+            response = _PROBE_SESSION.get(
+                POKERSCOUT_URL,
+                headers={'User-Agent': USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'},
+                timeout=DIRECT_FETCH_TIMEOUT
+            )
+        except requests.RequestException as e:
+            logger.warning(f"직접 요청 실패 - Selenium으로 전환: {e}")
+            return []
+        
+        if response.status_code != 200 or 'rankTable' not in response.text:
+            logger.info(f"직접 요청으로 랭킹 테이블을 받지 못함 ({response.status_code}) - Selenium으로 전환")
+            return []
+        
+        collected_data = self._parse_with_beautifulsoup(response.text)
+        logger.info(f"직접 요청으로 크롤링 완료: {len(collected_data)}개 사이트 수집")
+        return collected_data
+    
     def crawl_pokerscout_data(self, proxy: Optional[str] = None) -> List[Dict]:
         """PokerScout 데이터 크롤링 (Selenium 사용)"""
         logger.info("Selenium 기반 PokerScout 크롤링 시작...")
         driver = None
         
         try:
-            # 드라이버 생성
-            driver = self._create_driver(proxy)
-            
-            # PokerScout 접속
-            logger.info("PokerScout.com 접속 중...")
-            driver.get('https://www.pokerscout.com')
-            
-            # 초기 지연 (페이지 로딩 대기)
-            self._random_delay(2, 4)
-            
-            # 페이지 스크롤 (동적 콘텐츠 로딩)
-            self._scroll_page(driver)
-            
-            # 테이블 찾기 (여러 방법 시도)
-            logger.info("랭킹 테이블 검색 중...")
-            table = None
-            
-            # 방법 1: 클래스명으로 찾기
-            try:
-                wait = WebDriverWait(driver, 10)
-                table = wait.until(EC.presence_of_element_located((By.CLASS_NAME, "rankTable")))
-                logger.info("rankTable 클래스로 테이블 발견")
-            except TimeoutException:
-                logger.warning("rankTable 클래스로 테이블을 찾을 수 없음")
-                
-                # 방법 2: XPath로 찾기
-                try:
-                    table = driver.find_element(By.XPATH, "//table[contains(@class, 'rank')]")
-                    logger.info("XPath로 테이블 발견")
-                except:
-                    # 방법 3: 모든 테이블 중 첫 번째
-                    tables = driver.find_elements(By.TAG_NAME, "table")
-                    if tables:
-                        table = tables[0]
-                        logger.info(f"첫 번째 테이블 사용 (총 {len(tables)}개 테이블 발견)")
-            
-            if not table:
-                # 페이지 소스를 BeautifulSoup으로 파싱
-                logger.info("Selenium 대신 BeautifulSoup으로 파싱 시도...")
-                page_source = driver.page_source
-                return self._parse_with_beautifulsoup(page_source)
-            
-            # 테이블 데이터 추출
-            collected_data = []
-            rows = table.find_elements(By.TAG_NAME, "tr")[1:]  # 헤더 제외
-            logger.info(f"발견된 행 수: {len(rows)}")
-            
-            for i, row in enumerate(rows):
-                try:
-                    # 사이트 이름 추출
-                    try:
-                        brand_title = row.find_element(By.CLASS_NAME, "brand-title")
-                        site_name = brand_title.text.strip()
-                    except:
-                        continue
-                    
-                    if not site_name or len(site_name) < 2:
-                        continue
-                    
-                    # 플레이어 통계 추출
-                    players_online = self._extract_number(row, "online")
-                    cash_players = self._extract_number(row, "cash")
-                    peak_24h = self._extract_number(row, "peak")
-                    seven_day_avg = self._extract_number(row, "avg")
-                    
-                    if players_online == 0 and cash_players == 0 and peak_24h == 0:
-                        continue
-                    
-                    # 데이터 정리
-                    site_name = re.sub(r'[^\w\s\-\(\)\.&]', '', site_name).strip()
-                    category = 'GG_POKER' if site_name in self.gg_poker_sites else 'COMPETITOR'
-                    
-                    collected_data.append({
-                        'site_name': site_name,
-                        'category': category,
-                        'players_online': players_online,
-                        'cash_players': cash_players,
-                        'peak_24h': peak_24h,
-                        'seven_day_avg': seven_day_avg,
-                        'collected_at': datetime.now(timezone.utc).isoformat()
-                    })
-                    
-                except Exception as e:
-                    logger.debug(f"행 {i+1} 처리 중 오류: {e}")
-                    continue
-            
-            logger.info(f"크롤링 완료: {len(collected_data)}개 사이트 수집")
-            return collected_data
+            # 드라이버 준비 (이전 시도의 브라우저를 재사용)
+            driver = self._ensure_driver(proxy)
+            return self._crawl_page(driver)
             
         except Exception as e:
             logger.error(f"크롤링 실패: {e}")
@@ -286,19 +525,48 @@ class EnhancedPokerScoutCrawler:
                 except:
                     pass
             
-            return []
+            # 세션이 끊긴 드라이버는 다음 시도에서 새로 생성되도록 정리
+            if isinstance(e, WebDriverException) and not self._driver_alive():
+                self.close()
             
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+            return []
+    
+    def _crawl_page(self, driver) -> List[Dict]:
+        """주어진 드라이버로 PokerScout에 접속하여 랭킹 테이블 파싱"""
+        # PokerScout 접속
+        logger.info("PokerScout.com 접속 중...")
+        driver.get(POKERSCOUT_URL)
+        
+        # 고정 지연 대신 테이블 행이 DOM에 나타날 때까지만 대기
+        logger.info("랭킹 테이블 검색 중...")
+        try:
+            WebDriverWait(driver, 8).until(EC.presence_of_element_located(RANK_ROW_LOCATOR))
+            logger.info("rankTable 클래스로 테이블 발견")
+        except TimeoutException:
+            # 지연 로딩일 수 있으므로 끝까지 스크롤한 뒤 한 번 더 대기
+            self._scroll_page(driver)
+            try:
+                WebDriverWait(driver, 4).until(EC.presence_of_element_located(RANK_ROW_LOCATOR))
+                logger.info("스크롤 후 rankTable 클래스로 테이블 발견")
+            except TimeoutException:
+                logger.warning("rankTable 클래스로 테이블을 찾을 수 없음 - 페이지 소스에서 다른 테이블 검색")
+        
+        # 남은 광고/XHR 요청은 필요 없으므로 로딩 중단
+        try:
+            driver.execute_script("window.stop();")
+        except WebDriverException as e:
+            logger.debug(f"페이지 로딩 중단 실패: {e}")
+        
+        # 행/셀마다 WebDriver 명령을 보내지 않고 페이지 소스를 한 번 가져와 로컬에서 파싱
+        collected_data = self._parse_with_beautifulsoup(driver.page_source)
+        logger.info(f"크롤링 완료: {len(collected_data)}개 사이트 수집")
+        return collected_data
     
     def _parse_with_beautifulsoup(self, page_source: str) -> List[Dict]:
         """BeautifulSoup으로 페이지 소스 파싱"""
         try:
-            soup = BeautifulSoup(page_source, 'html.parser')
+            # C로 구현된 lxml 파서 사용 (html.parser보다 수 배 빠름)
+            soup = BeautifulSoup(page_source, 'lxml')
             table = soup.find('table', {'class': 'rankTable'})
             
             if not table:
@@ -314,6 +582,8 @@ class EnhancedPokerScoutCrawler:
             
             collected_data = []
             rows = table.find_all('tr')[1:]
+            # 한 번의 크롤링에서 수집된 행은 같은 수집 시각을 공유 (traffic_logs 문서 ID로도 사용되므로 밀리초까지만)
+            collected_at = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
             
             for row in rows:
                 try:
@@ -326,54 +596,28 @@ class EnhancedPokerScoutCrawler:
                         continue
                     
                     # 통계 추출
-                    players_online = 0
-                    online_td = row.find('td', {'id': 'online'})
-                    if online_td:
-                        span = online_td.find('span')
-                        if span:
-                            text = span.get_text(strip=True).replace(',', '')
-                            if text.isdigit():
-                                players_online = int(text)
+                    # id가 있는 셀은 한 번의 탐색으로 수집 (같은 id가 여러 개면 첫 번째 셀)
+                    cells_by_id = {}
+                    for td in row.find_all('td', id=True):
+                        cells_by_id.setdefault(td['id'], td)
                     
-                    cash_players = 0
-                    cash_td = row.find('td', {'id': 'cash'})
-                    if cash_td:
-                        text = cash_td.get_text(strip=True).replace(',', '')
-                        if text.isdigit():
-                            cash_players = int(text)
+                    stats = {}
+                    for key, td_id, use_span in _TD_FIELDS:
+                        td = cells_by_id.get(td_id)
+                        cell = td.find('span') if td and use_span else td
+                        stats[key] = _to_int(cell.get_text()) if cell else 0
                     
-                    peak_24h = 0
-                    peak_td = row.find('td', {'id': 'peak'})
-                    if peak_td:
-                        span = peak_td.find('span')
-                        if span:
-                            text = span.get_text(strip=True).replace(',', '')
-                            if text.isdigit():
-                                peak_24h = int(text)
-                    
-                    seven_day_avg = 0
-                    avg_td = row.find('td', {'id': 'avg'})
-                    if avg_td:
-                        span = avg_td.find('span')
-                        if span:
-                            text = span.get_text(strip=True).replace(',', '')
-                            if text.isdigit():
-                                seven_day_avg = int(text)
-                    
-                    if players_online == 0 and cash_players == 0 and peak_24h == 0:
+                    if stats['players_online'] == 0 and stats['cash_players'] == 0 and stats['peak_24h'] == 0:
                         continue
                     
-                    site_name = re.sub(r'[^\w\s\-\(\)\.&]', '', site_name).strip()
+                    site_name = _SITE_NAME_RE.sub('', site_name).strip()
                     category = 'GG_POKER' if site_name in self.gg_poker_sites else 'COMPETITOR'
                     
                     collected_data.append({
                         'site_name': site_name,
                         'category': category,
-                        'players_online': players_online,
-                        'cash_players': cash_players,
-                        'peak_24h': peak_24h,
-                        'seven_day_avg': seven_day_avg,
-                        'collected_at': datetime.now(timezone.utc).isoformat()
+                        **stats,
+                        'collected_at': collected_at
                     })
                     
                 except Exception as e:
@@ -385,26 +629,43 @@ class EnhancedPokerScoutCrawler:
         except Exception as e:
             logger.error(f"BeautifulSoup 파싱 실패: {e}")
             return []
-    
-    def _extract_number(self, row, td_id: str) -> int:
-        """테이블 셀에서 숫자 추출"""
+
+# 현재 프로세스에서 마지막으로 발급받은 토큰 {key_path, token, exp}과 서비스 계정 자격 증명
+_access_token_cache = None
+_credentials_cache = {}
+
+def _load_cached_access_token(key_path: str) -> Optional[str]:
+    """같은 키 파일로 발급받은 토큰이 아직 유효하면 반환 (메모리 -> 파일 순서로 확인)"""
+    cached = _access_token_cache
+    if cached is None:
         try:
-            td = row.find_element(By.ID, td_id)
-            # span 태그 내부 텍스트 확인
-            try:
-                span = td.find_element(By.TAG_NAME, "span")
-                text = span.text.strip().replace(',', '')
-            except:
-                text = td.text.strip().replace(',', '')
-            
-            if text.isdigit():
-                return int(text)
-        except:
-            pass
-        return 0
+            with open(ACCESS_TOKEN_CACHE_PATH, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    if not isinstance(cached, dict) or cached.get('key_path') != key_path:
+        return None
+    if time.time() >= cached.get('exp', 0) - ACCESS_TOKEN_REFRESH_MARGIN:
+        return None
+    return cached.get('token')
+
+def _save_access_token(key_path: str, token: str, exp: float):
+    """발급받은 토큰을 메모리와 파일에 저장 (소유자만 읽을 수 있는 임시 파일에 쓴 뒤 교체)"""
+    global _access_token_cache
+    _access_token_cache = {'key_path': key_path, 'token': token, 'exp': exp}
+    
+    tmp_path = f"{ACCESS_TOKEN_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(_access_token_cache, f)
+        os.replace(tmp_path, ACCESS_TOKEN_CACHE_PATH)
+    except OSError as e:
+        logger.warning(f"액세스 토큰 캐시 저장 실패: {e}")
 
 def get_access_token():
-    """서비스 계정 키에서 액세스 토큰 생성"""
+    """서비스 계정 키에서 액세스 토큰 생성 (만료 60초 전까지는 캐시된 토큰 재사용)"""
     try:
         possible_key_paths = [
             os.path.join(os.path.dirname(os.path.abspath(__file__)), 'key', 'firebase-service-account-key.json'),
@@ -421,58 +682,56 @@ def get_access_token():
         if not key_path:
             logger.warning("Firebase 키 파일을 찾을 수 없습니다.")
             return None
-            
-        credentials = service_account.Credentials.from_service_account_file(
-            key_path,
-            scopes=['https://www.googleapis.com/auth/datastore']
-        )
+        
+        cached_token = _load_cached_access_token(key_path)
+        if cached_token:
+            logger.info("캐시된 Firebase 액세스 토큰 사용")
+            return cached_token
+        
+        # 서비스 계정 자격 증명은 키 파일마다 한 번만 로드
+        credentials = _credentials_cache.get(key_path)
+        if credentials is None:
+            credentials = service_account.Credentials.from_service_account_file(
+                key_path,
+                scopes=['https://www.googleapis.com/auth/datastore']
+            )
+            _credentials_cache[key_path] = credentials
         
         credentials.refresh(Request())
+        if credentials.expiry:
+            # google-auth의 expiry는 시간대 정보가 없는 UTC 시각
+            _save_access_token(key_path, credentials.token, credentials.expiry.replace(tzinfo=timezone.utc).timestamp())
         return credentials.token
         
     except Exception as e:
         logger.error(f"액세스 토큰 생성 실패: {e}")
         return None
 
-def upload_to_firestore_rest(data, access_token=None):
-    """Firestore REST API를 사용하여 데이터 업로드"""
-    if not data:
-        logger.warning("업로드할 데이터가 없습니다.")
-        return False
-    
-    logger.info("Firestore REST API로 데이터 업로드 시작...")
+def _commit_site_chunk(chunk, headers: Dict, last_updated_at: str) -> int:
+    """사이트 묶음의 sites 문서와 traffic_logs 문서 쓰기를 commit 요청 하나로 전송 (성공한 사이트 수 반환)"""
+    writes = []
     
-    headers = {'Content-Type': 'application/json'}
-    if access_token:
-        headers['Authorization'] = f'Bearer {access_token}'
-    
-    success_count = 0
-    
-    try:
-        for site_data in data:
-            site_name = site_data['site_name']
-            collected_at_iso = site_data['collected_at']
-            
-            # 1. sites 컬렉션 업데이트
-            site_url = f"{FIRESTORE_BASE_URL}/sites/{site_name}"
-            site_doc = {
+    for site_data in chunk:
+        site_name = site_data['site_name']
+        collected_at_iso = site_data['collected_at']
+        site_doc_name = f"{FIRESTORE_DOCUMENTS_PATH}/sites/{site_name}"
+        
+        # 1. sites 컬렉션 업데이트
+        writes.append({
+            "update": {
+                "name": site_doc_name,
                 "fields": {
                     "site_name": {"stringValue": site_name},
                     "category": {"stringValue": site_data['category']},
-                    "last_updated_at": {"timestampValue": datetime.now(timezone.utc).isoformat()}
+                    "last_updated_at": {"timestampValue": last_updated_at}
                 }
             }
-            
-            response = requests.patch(site_url, json=site_doc, headers=headers)
-            
-            if response.status_code not in [200, 204]:
-                logger.warning(f"사이트 문서 업데이트 실패 ({site_name}): {response.status_code}")
-                continue
-            
-            # 2. traffic_logs 하위 컬렉션에 추가
-            doc_id = collected_at_iso
-            traffic_url = f"{FIRESTORE_BASE_URL}/sites/{site_name}/traffic_logs/{doc_id}"
-            traffic_doc = {
+        })
+        
+        # 2. traffic_logs 하위 컬렉션에 추가
+        writes.append({
+            "update": {
+                "name": f"{site_doc_name}/traffic_logs/{collected_at_iso}",
                 "fields": {
                     "players_online": {"integerValue": str(site_data['players_online'])},
                     "cash_players": {"integerValue": str(site_data['cash_players'])},
@@ -481,13 +740,40 @@ def upload_to_firestore_rest(data, access_token=None):
                     "collected_at": {"timestampValue": collected_at_iso}
                 }
             }
-            
-            response = requests.patch(traffic_url, json=traffic_doc, headers=headers)
-            
-            if response.status_code in [200, 201]:
-                success_count += 1
-            else:
-                logger.warning(f"트래픽 로그 생성 실패 ({site_name}): {response.status_code}")
+        })
+    
+    # requests의 json= 대신 orjson으로 한 번에 직렬화한 bytes 전송
+    body = orjson.dumps({"writes": writes})
+    response = _HTTP_SESSION.post(FIRESTORE_COMMIT_URL, data=body, headers=headers)
+    
+    if response.status_code == 200:
+        return len(chunk)
+    # commit은 원자적이므로 실패 시 묶음 전체가 기록되지 않음
+    logger.warning(f"Firestore 일괄 쓰기 실패 ({len(chunk)}개 사이트): {response.status_code} {response.text[:200]}")
+    return 0
+
+def upload_to_firestore_rest(data, access_token=None):
+    """Firestore REST API를 사용하여 데이터 업로드 (documents:commit으로 묶어서 전송)"""
+    if not data:
+        logger.warning("업로드할 데이터가 없습니다.")
+        return False
+    
+    logger.info("Firestore REST API로 데이터 업로드 시작...")
+    
+    headers = {'Content-Type': 'application/json'}
+    if access_token:
+        headers['Authorization'] = f'Bearer {access_token}'
+    
+    last_updated_at = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+    chunks = [data[start:start + FIRESTORE_COMMIT_SITES] for start in range(0, len(data), FIRESTORE_COMMIT_SITES)]
+    
+    try:
+        # 묶음별 commit은 서로 독립적이므로 동시에 전송 (Firestore 부하를 고려해 동시 요청 수 제한)
+        with ThreadPoolExecutor(max_workers=min(FIRESTORE_UPLOAD_WORKERS, len(chunks))) as executor:
+            success_count = sum(executor.map(
+                lambda chunk: _commit_site_chunk(chunk, headers, last_updated_at),
+                chunks
+            ))
         
         logger.info(f"성공적으로 {success_count}/{len(data)}개 사이트의 데이터를 Firestore에 업로드했습니다.")
         return success_count > 0
@@ -497,19 +783,25 @@ def upload_to_firestore_rest(data, access_token=None):
         return False
 
 def save_backup_json(data):
-    """백업용 JSON 저장"""
+    """백업용 JSON 저장 (gzip 압축, 임시 파일에 쓴 뒤 교체하여 중간에 끊겨도 깨진 파일이 남지 않음)"""
     if not data:
         return
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"crawl_backup_{timestamp}.json"
+    filename = f"crawl_backup_{timestamp}.json.gz"
+    tmp_filename = f"{filename}.tmp"
     
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with gzip.open(tmp_filename, 'wb', compresslevel=6) as f:
+            f.write(orjson.dumps(data))
+        os.replace(tmp_filename, filename)
         logger.info(f"백업 데이터를 {filename}에 저장했습니다.")
     except Exception as e:
         logger.error(f"백업 저장 실패: {e}")
+        try:
+            os.remove(tmp_filename)
+        except OSError:
+            pass
 
 def run_enhanced_crawl():
     """향상된 크롤링 실행"""
@@ -520,16 +812,15 @@ def run_enhanced_crawl():
         # GitHub Actions 환경 확인
         is_github_actions = os.environ.get('GITHUB_ACTIONS') == 'true'
         
-        # 크롤러 인스턴스 생성
+        # 크롤러 인스턴스 생성 (브라우저는 재시도 간 재사용 후 with 블록을 벗어날 때 한 번만 종료)
         # GitHub Actions에서는 헤드리스 모드 강제, 프록시는 선택적
-        crawler = EnhancedPokerScoutCrawler(
+        with EnhancedPokerScoutCrawler(
             use_proxy=not is_github_actions,  # GitHub Actions에서는 프록시 비활성화
             headless=True  # 항상 헤드리스 모드
-        )
-        
-        # 재시도 로직이 포함된 크롤링 실행
-        logger.info("크롤링 시작...")
-        crawled_data = crawler.crawl_with_retry()
+        ) as crawler:
+            # 재시도 로직이 포함된 크롤링 실행
+            logger.info("크롤링 시작...")
+            crawled_data = crawler.crawl_with_retry()
         
         if crawled_data:
             logger.info(f"크롤링 성공: {len(crawled_data)}개 사이트 발견")
@@ -12,7 +12,7 @@ from datetime import datetime, timezone
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.services.poker_crawler import LivePokerScoutCrawler, upload_to_firestore_efficiently, db
+from app.services.poker_crawler import LivePokerScoutCrawler, upload_to_firestore_efficiently, _get_db
 
 def test_firebase_connection():
     """Firebase connection test"""
@@ -21,6 +21,7 @@ def test_firebase_connection():
     print("=" * 60)
     
     # 1. Check Firebase connection
+    db = _get_db()
     if db is None:
         print("[FAILED] Firebase connection failed!")
         print("Please check if Firebase service account key file exists in one of these paths:")
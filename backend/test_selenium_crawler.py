@@ -3,40 +3,138 @@
 Selenium 크롤러 로컬 테스트 스크립트
 - 다양한 설정으로 크롤러 테스트
 - 성공/실패 케이스 확인
+
+Selenium Grid 사용 (테스트마다 로컬 Chrome을 띄우지 않음):
+    docker run -d -p 4444:4444 -e SE_NODE_MAX_SESSIONS=4 selenium/standalone-chrome
+    python test_selenium_crawler.py --selenium-hub http://localhost:4444
 """
 import sys
 import os
+import argparse
+import importlib.util
+import atexit
+import threading
 import logging
-from datetime import datetime
-import json
+import logging.handlers
+import queue
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import orjson
 
 # 경로 설정
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# 테스트 실행 시작 시각 - 결과 파일 이름과 각 테스트의 경과 시간 기준으로 사용
+_RUN_STARTED = time.monotonic()
+_RUN_STARTED_AT = datetime.now(timezone.utc)
+_RUN_TS = _RUN_STARTED_AT.astimezone().strftime("%Y%m%d_%H%M%S")
+
 # 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# 동시에 도는 테스트 스레드는 큐에 기록만 하고, 콘솔/파일 출력은 별도 리스너 스레드에서 처리
+# 시각은 strftime 없이 실행 시작 후 경과 밀리초(relativeCreated)로 표시
+_LOG_FORMATTER = logging.Formatter('%(relativeCreated)d %(threadName)s %(levelname).1s %(message)s')
+_log_handlers = [
+    logging.StreamHandler(),
+    logging.FileHandler(f"test_run_{_RUN_TS}.log", encoding='utf-8', delay=True),
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_LOG_FORMATTER)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# QueueHandler는 큐에 넣기 전에 메시지를 미리 포맷하므로 메시지 본문만 남기고 나머지는 리스너 쪽 포맷 사용
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger(__name__)
 
+# 테스트 구간 구분선
+_BANNER = "=" * 50
+
+# 테스트용 크롤러에 추가하는 Chrome 속도 옵션 (필요 없는 백그라운드 기능과 이미지/알림 비활성화)
+# 프로필 디렉터리(--user-data-dir)는 동시에 뜨는 브라우저끼리 공유할 수 없으므로 지정하지 않음
+TEST_CHROME_ARGS = [
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--blink-settings=imagesEnabled=false',
+    '--disable-background-networking',
+    '--disable-sync',
+]
+TEST_CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+# (use_proxy, headless) 조합마다 하나만 만들어 테스트 간에 공유하는 크롤러와 사용 잠금
+# 브라우저 시작 비용을 한 번만 내고, 같은 드라이버를 동시에 조작하지 않도록 잠금으로 직렬화
+_crawlers = {}
+_crawlers_lock = threading.Lock()
+# --selenium-hub로 지정한 원격 Selenium 주소 (없으면 로컬 Chrome)
+_selenium_hub = None
+# (use_proxy, headless) 조합별로 이번 실행에서 이미 성공한 크롤링 결과
+_crawl_results = {}
+
+def get_crawler(use_proxy: bool, headless: bool):
+    """공유 크롤러와 해당 크롤러의 잠금 반환 (처음 요청될 때 생성)"""
+    key = (use_proxy, headless)
+    with _crawlers_lock:
+        if key not in _crawlers:
+            from selenium_crawler_advanced import EnhancedPokerScoutCrawler
+            crawler = EnhancedPokerScoutCrawler(
+                use_proxy=use_proxy,
+                headless=headless,
+                chrome_args=TEST_CHROME_ARGS,
+                chrome_prefs=TEST_CHROME_PREFS,
+                remote_url=_selenium_hub
+            )
+            _crawlers[key] = (crawler, threading.Lock())
+        return _crawlers[key]
+
+def crawl_shared(use_proxy: bool, headless: bool):
+    """
+    공유 크롤러로 crawl_pokerscout_data 실행 - 같은 설정으로 이미 성공한 결과가 있으면 다시 가져오지 않음
+    (실패한 결과는 저장하지 않으므로 다음 호출에서 다시 시도)
+    """
+    key = (use_proxy, headless)
+    crawler, lock = get_crawler(use_proxy=use_proxy, headless=headless)
+    with lock:
+        if key not in _crawl_results:
+            data = crawler.crawl_pokerscout_data()
+            if not data:
+                return data
+            _crawl_results[key] = data
+        else:
+            logger.info("같은 설정으로 이미 가져온 크롤링 결과 재사용")
+        return _crawl_results[key]
+
+@atexit.register
+def close_crawlers():
+    """프로세스 종료 시 공유 크롤러의 브라우저를 한 번에 종료"""
+    with _crawlers_lock:
+        crawlers = list(_crawlers.values())
+        _crawlers.clear()
+    for crawler, _ in crawlers:
+        crawler.close()
+
 def test_basic_crawling():
     """기본 크롤링 테스트"""
-    logger.info("=" * 50)
+    logger.info(_BANNER)
     logger.info("테스트 1: 기본 크롤링 (프록시 없음, 헤드리스)")
-    logger.info("=" * 50)
+    logger.info(_BANNER)
     
     try:
-        from selenium_crawler_advanced import EnhancedPokerScoutCrawler
-        
-        crawler = EnhancedPokerScoutCrawler(use_proxy=False, headless=True)
-        data = crawler.crawl_pokerscout_data()
+        data = crawl_shared(use_proxy=False, headless=True)
         
         if data:
             logger.info(f"✅ 성공: {len(data)}개 사이트 크롤링")
             # 상위 5개 사이트 출력
-            for i, site in enumerate(data[:5], 1):
-                logger.info(f"  {i}. {site['site_name']}: {site['players_online']} players")
+            if logger.isEnabledFor(logging.INFO):
+                for i, site in enumerate(data[:5], 1):
+                    logger.info("  %d. %s: %s players", i, site['site_name'], site['players_online'])
             return True
         else:
             logger.error("❌ 실패: 데이터를 가져오지 못함")
@@ -50,23 +148,21 @@ def test_basic_crawling():
 
 def test_with_proxy():
     """프록시를 사용한 크롤링 테스트"""
-    logger.info("=" * 50)
+    logger.info(_BANNER)
     logger.info("테스트 2: 프록시 로테이션 크롤링")
-    logger.info("=" * 50)
+    logger.info(_BANNER)
     
     try:
-        from selenium_crawler_advanced import EnhancedPokerScoutCrawler
-        
-        crawler = EnhancedPokerScoutCrawler(use_proxy=True, headless=True)
-        data = crawler.crawl_with_retry()
+        crawler, lock = get_crawler(use_proxy=True, headless=True)
+        with lock:
+            data = crawler.crawl_with_retry()
         
         if data:
             logger.info(f"✅ 성공: {len(data)}개 사이트 크롤링 (프록시 사용)")
             return True
         else:
             logger.warning("⚠️ 프록시로 실패, 일반 모드로 재시도...")
-            crawler = EnhancedPokerScoutCrawler(use_proxy=False, headless=True)
-            data = crawler.crawl_pokerscout_data()
+            data = crawl_shared(use_proxy=False, headless=True)
             if data:
                 logger.info(f"✅ 일반 모드로 성공: {len(data)}개 사이트")
                 return True
@@ -80,16 +176,15 @@ def test_with_proxy():
 
 def test_visible_browser():
     """브라우저를 보이게 하여 테스트 (디버깅용)"""
-    logger.info("=" * 50)
+    logger.info(_BANNER)
     logger.info("테스트 3: 브라우저 표시 모드 (디버깅)")
-    logger.info("=" * 50)
+    logger.info(_BANNER)
     
     try:
-        from selenium_crawler_advanced import EnhancedPokerScoutCrawler
-        
         logger.info("브라우저가 열립니다. 크롤링 과정을 확인하세요...")
-        crawler = EnhancedPokerScoutCrawler(use_proxy=False, headless=False)
-        data = crawler.crawl_pokerscout_data()
+        crawler, lock = get_crawler(use_proxy=False, headless=False)
+        with lock:
+            data = crawler.crawl_pokerscout_data()
         
         if data:
             logger.info(f"✅ 성공: {len(data)}개 사이트 크롤링")
@@ -104,9 +199,9 @@ def test_visible_browser():
 
 def test_old_crawler():
     """기존 크롤러와 비교 테스트"""
-    logger.info("=" * 50)
+    logger.info(_BANNER)
     logger.info("테스트 4: 기존 크롤러 (cloudscraper) 테스트")
-    logger.info("=" * 50)
+    logger.info(_BANNER)
     
     try:
         from github_actions_crawler_firestore import LivePokerScoutCrawler
@@ -125,80 +220,151 @@ def test_old_crawler():
         logger.error(f"❌ 기존 크롤러 테스트 실패: {e}")
         return False
 
-def save_test_results(results):
-    """테스트 결과 저장"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"test_results_{timestamp}.json"
-    
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+def append_test_result(filename, test_name, entry):
+    """테스트 하나가 끝날 때마다 결과를 JSON Lines 파일에 한 줄 추가 (중간에 중단돼도 끝난 결과는 남음)"""
+    with open(filename, 'ab') as f:
+        f.write(orjson.dumps({'test': test_name, **entry}) + b"\n")
+
+def save_test_results(results, filename):
+    """전체 테스트 결과 저장"""
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
     
     logger.info(f"테스트 결과를 {filename}에 저장했습니다.")
 
+def run_test(test_name, test_func):
+    """테스트 하나를 실행하고 결과 항목 반환 (elapsed_s: 실행 시작부터 테스트 종료까지 걸린 초)"""
+    try:
+        logger.info(f"\n실행 중: {test_name}")
+        success = test_func()
+        return {
+            'success': success,
+            'elapsed_s': round(time.monotonic() - _RUN_STARTED, 3)
+        }
+    except Exception as e:
+        logger.error(f"테스트 {test_name} 실행 실패: {e}")
+        return {
+            'success': False,
+            'error': str(e),
+            'elapsed_s': round(time.monotonic() - _RUN_STARTED, 3)
+        }
+
+# 명령행에서 고를 수 있는 테스트: 키 -> (이름, 함수, Selenium 필요 여부)
+# Chrome을 띄우지 않는 가벼운 테스트를 앞에 둠
+TESTS = {
+    'old': ("기존 크롤러", test_old_crawler, False),
+    'basic': ("기본 크롤링", test_basic_crawling, True),
+    'proxy': ("프록시 크롤링", test_with_proxy, True),
+}
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Selenium 크롤러 로컬 테스트")
+    parser.add_argument('--tests', default=','.join(TESTS),
+                        help=f"실행할 테스트 (쉼표로 구분, 기본값: {','.join(TESTS)})")
+    parser.add_argument('--visible', action='store_true',
+                        help="브라우저 표시 모드 테스트도 실행 (디버깅용)")
+    parser.add_argument('--selenium-hub', metavar='URL',
+                        help="로컬 Chrome 대신 사용할 Selenium Grid / standalone-chrome 주소 (예: http://localhost:4444)")
+    return parser.parse_args()
+
 def main():
     """메인 테스트 실행"""
     logger.info("🚀 Selenium 크롤러 테스트 시작")
     logger.info("현재 디렉토리: " + os.getcwd())
     
     results = {
-        'test_time': datetime.now().isoformat(),
+        'test_time': _RUN_STARTED_AT.isoformat(),
         'tests': {}
     }
+    results_file = f"test_results_{_RUN_TS}.json"
+    progress_file = f"test_results_{_RUN_TS}.jsonl"
     
-    # 필수 라이브러리 확인
-    try:
-        import undetected_chromedriver
-        import selenium
-        logger.info("✅ 필수 라이브러리 설치 확인됨")
-    except ImportError:
-        logger.error("❌ 필수 라이브러리가 설치되지 않았습니다.")
-        logger.error("다음 명령어를 실행하세요:")
-        logger.error("pip install undetected-chromedriver selenium")
+    global _selenium_hub
+    # 오래 살아 있는 프로세스에서 다시 실행해도 이전 결과를 쓰지 않도록 초기화
+    _crawl_results.clear()
+    args = parse_args()
+    _selenium_hub = args.selenium_hub
+    if _selenium_hub:
+        logger.info(f"원격 Selenium 사용: {_selenium_hub}")
+    selected = [key for key in args.tests.split(',') if key]
+    unknown = [key for key in selected if key not in TESTS]
+    if unknown:
+        logger.error(f"❌ 알 수 없는 테스트: {', '.join(unknown)} (사용 가능: {', '.join(TESTS)})")
         return
     
     # 테스트 실행
-    tests = [
-        ("기본 크롤링", test_basic_crawling),
-        ("프록시 크롤링", test_with_proxy),
-        ("기존 크롤러", test_old_crawler),
-    ]
-    
-    # 대화형 모드 확인
-    if len(sys.argv) > 1 and sys.argv[1] == '--visible':
-        tests.append(("브라우저 표시", test_visible_browser))
-    
-    for test_name, test_func in tests:
-        try:
-            logger.info(f"\n실행 중: {test_name}")
-            success = test_func()
-            results['tests'][test_name] = {
-                'success': success,
-                'timestamp': datetime.now().isoformat()
-            }
-        except Exception as e:
-            logger.error(f"테스트 {test_name} 실행 실패: {e}")
-            results['tests'][test_name] = {
-                'success': False,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
+    fast_exit = os.environ.get('PS_FAST_EXIT') == '1'
+    test_results = {}
+    
+    # PS_FAST_EXIT=1이면 Chrome이 필요 없는 테스트를 먼저 실행하고, 하나라도 성공하면 나머지는 건너뜀
+    if fast_exit:
+        for key in selected:
+            if TESTS[key][2]:
+                continue
+            test_name, test_func = TESTS[key][:2]
+            test_results[test_name] = run_test(test_name, test_func)
+            append_test_result(progress_file, test_name, test_results[test_name])
+            if test_results[test_name]['success']:
+                break
+        if any(result['success'] for result in test_results.values()):
+            logger.info("⏭️ 빠른 테스트가 성공하여 나머지 테스트를 건너뜁니다 (PS_FAST_EXIT=1)")
+            for key in selected:
+                test_results.setdefault(TESTS[key][0], {'success': False, 'skipped': True})
+    
+    remaining = [key for key in selected if TESTS[key][0] not in test_results]
+    run_visible = args.visible and not any(result.get('skipped') for result in test_results.values())
+    
+    # 필수 라이브러리 확인 (Selenium 테스트를 실행할 때만, import 없이 설치 여부만 확인)
+    if run_visible or any(TESTS[key][2] for key in remaining):
+        if all(importlib.util.find_spec(name) for name in ('undetected_chromedriver', 'selenium')):
+            logger.info("✅ 필수 라이브러리 설치 확인됨")
+        else:
+            logger.error("❌ 필수 라이브러리가 설치되지 않았습니다.")
+            logger.error("다음 명령어를 실행하세요:")
+            logger.error("pip install undetected-chromedriver selenium")
+            return
+    
+    tests_to_run = [TESTS[key][:2] for key in remaining]
+    
+    # 각 테스트는 서로 독립적이고 대부분 네트워크 대기이므로 동시에 실행
+    # (결과는 메인 스레드에서만 기록하고, 요약은 테스트 목록 순서로 출력)
+    # uc.Chrome 생성은 selenium_crawler_advanced._driver_create_lock으로 직렬화되므로
+    # 동시에 시작해도 드라이버 바이너리 패치가 경쟁하지 않음 - 생성 이후의 크롤링만 병렬
+    if tests_to_run:
+        with ThreadPoolExecutor(max_workers=len(tests_to_run), thread_name_prefix='test') as executor:
+            futures = {executor.submit(run_test, test_name, test_func): test_name for test_name, test_func in tests_to_run}
+            for future in as_completed(futures):
+                test_name = futures[future]
+                test_results[test_name] = future.result()
+                append_test_result(progress_file, test_name, test_results[test_name])
+    for key in selected:
+        results['tests'][TESTS[key][0]] = test_results[TESTS[key][0]]
+    
+    # 대화형 모드 확인 (브라우저 창은 다른 테스트와 겹치지 않도록 마지막에 단독 실행)
+    if run_visible:
+        results['tests']["브라우저 표시"] = run_test("브라우저 표시", test_visible_browser)
+        append_test_result(progress_file, "브라우저 표시", results['tests']["브라우저 표시"])
     
     # 결과 요약
-    logger.info("\n" + "=" * 50)
+    logger.info("\n%s", _BANNER)
     logger.info("📊 테스트 결과 요약")
-    logger.info("=" * 50)
+    logger.info(_BANNER)
     
     success_count = sum(1 for r in results['tests'].values() if r.get('success'))
-    total_count = len(results['tests'])
+    total_count = sum(1 for r in results['tests'].values() if not r.get('skipped'))
     
     for test_name, result in results['tests'].items():
-        status = "✅ 성공" if result.get('success') else "❌ 실패"
+        if result.get('skipped'):
+            status = "⏭️ 건너뜀"
+        else:
+            status = "✅ 성공" if result.get('success') else "❌ 실패"
         logger.info(f"{test_name}: {status}")
     
-    logger.info(f"\n전체: {success_count}/{total_count} 성공")
+    logger.info("\n전체: %d/%d 성공", success_count, total_count)
     
     # 결과 저장
-    save_test_results(results)
+    save_test_results(results, results_file)
     
     # 권장사항
     if success_count == 0: